@@ -4,10 +4,116 @@ class Config:
     BASE_URL = "https://qa.eyther.ai"
     LOGIN_URL = f"{BASE_URL}/login"
     BROWSER = "chromium"
-    HEADLESS = False
+    # Headless unless HEADLESS=false, --headed or a run profile (e.g. debug) asks for a visible browser
+    HEADLESS = os.environ.get("HEADLESS", "true").lower() != "false"
+    # Longest any action may wait; also the ceiling of the adaptive timeouts below
     TIMEOUT = 30000
+    
+    # API paths the dashboard and claims pages load their data from; a page counts as ready
+    # once its response has arrived (see READY_RESPONSES in the page objects). Unset until the
+    # host's real endpoints are known: pages then wait for their key element only.
+    # test_runner.py --standin sets them to the stand-in server's endpoints
+    DASHBOARD_API_PATH = os.environ.get("DASHBOARD_API_PATH")
+    CLAIMS_API_PATH = os.environ.get("CLAIMS_API_PATH")
     SCREENSHOT_DIR = "screenshots"
     
+    # Screenshot storage: format (webp, jpeg or png) and quality are applied in the
+    # background. Each image is stored once under SCREENSHOT_BLOB_DIR by content hash and
+    # screenshot names are hard links to it; checkpoint captures within
+    # SCREENSHOT_DEDUP_DISTANCE bits of perceptual hash of one of the last
+    # SCREENSHOT_INDEX_SIZE stored images reuse it, failure captures only reuse exact matches
+    SCREENSHOT_FORMAT = os.environ.get("SCREENSHOT_FORMAT", "webp")
+    SCREENSHOT_QUALITY = int(os.environ.get("SCREENSHOT_QUALITY", "80"))
+    SCREENSHOT_DEDUP_DISTANCE = 3
+    SCREENSHOT_INDEX_DIR = os.path.join(SCREENSHOT_DIR, ".index")
+    SCREENSHOT_BLOB_DIR = os.path.join(SCREENSHOT_INDEX_DIR, "blobs")
+    SCREENSHOT_INDEX_SIZE = 500
+    # Background writer pool; a full queue makes the capturing test wait
+    SCREENSHOT_WRITERS = 2
+    SCREENSHOT_QUEUE_SIZE = 16
+    SCREENSHOT_STATS_DIR = os.path.join("reports", "screenshot_stats")
+    # Which test checkpoints are screenshotted: always, on-failure, sample or on-change
+    SCREENSHOT_POLICY = os.environ.get("SCREENSHOT_POLICY", "always")
+    SCREENSHOT_SAMPLE_RATE = 10
+    
+    # Logged-in storage state cache (seconds before a cached login is treated as stale)
+    AUTH_STATE_DIR = ".auth"
+    AUTH_STATE_TTL = 1800
+    
+    # Per-test durations from past runs, used to balance parallel workers
+    DURATIONS_DIR = os.path.join("reports", "durations")
+    WORKER_RESULTS_DIR = os.path.join("reports", "workers")
+    
+    # Per-worker JSONL result shards, merged before the report is generated
+    RESULTS_DIR = os.path.join("reports", "results")
+    
+    # Network mode: "live" talks to BASE_URL, "record" saves one HAR per test module,
+    # "replay" serves those HARs through routing with no network at all
+    HAR_MODE = os.environ.get("HAR_MODE", "live")
+    HAR_DIR = "hars"
+    # Ignored when matching replayed requests: cache busters and per-request noise
+    HAR_IGNORED_QUERY_PARAMS = ["_", "t", "ts", "timestamp", "cacheBust"]
+    HAR_IGNORED_BODY_FIELDS = ["timestamp", "requestId", "nonce"]
+    
+    # Default resource-blocking route profile (full, no-media, minimal); tests can
+    # pick their own with @pytest.mark.route_profile("...")
+    ROUTE_PROFILE = os.environ.get("ROUTE_PROFILE", "full")
+    RESOURCE_SIZES_DIR = os.path.join("reports", "resource_sizes")
+    
+    # Report screenshots: "assets" stores each image once under reports/assets with a
+    # thumbnail, "single-file" inlines them as base64 so the report can be emailed
+    REPORT_ASSET_MODE = os.environ.get("REPORT_ASSET_MODE", "assets")
+    REPORT_ASSETS_DIR = "assets"
+    
+    # Run profile picked by test_runner.py --profile (ci-fast, debug, forensics); it exports
+    # HEADLESS and BROWSER_LAUNCH_ARGS for the pytest processes
+    RUN_PROFILE = os.environ.get("RUN_PROFILE", "debug")
+    BROWSER_LAUNCH_ARGS = os.environ.get("BROWSER_LAUNCH_ARGS", "").split()
+    PROFILE_TIMINGS_PATH = os.path.join("reports", "profile_timings.json")
+    
+    # Playwright traces (on, off, retain-on-failure), saved next to the reports so they can be linked
+    TRACE_MODE = os.environ.get("TRACE_MODE", "retain-on-failure")
+    TRACE_DIR = os.path.join("reports", "traces")
+    
+    # Timed spans for page-object methods and the Playwright actions inside them ("on"/"off")
+    STEP_TIMING = os.environ.get("STEP_TIMING", "on")
+    
+    # Every run's results, queried for the report's trend sections; runs beyond
+    # HISTORY_MAX_RUNS are dropped, and only the newest REPORT_RETENTION HTML reports are kept
+    HISTORY_DB = os.path.join("reports", "history.sqlite3")
+    HISTORY_MAX_RUNS = 500
+    REPORT_RETENTION = int(os.environ.get("REPORT_RETENTION", "20"))
+    
+    # Flake score: share of a test's last FLAKE_WINDOW runs where it flipped between pass and
+    # fail. At FLAKE_THRESHOLD or above, test_runner.py --quarantine moves it to its own lane
+    # that reruns failures up to QUARANTINE_RETRIES times and never fails the run
+    FLAKE_WINDOW = 20
+    FLAKE_MIN_RUNS = 4
+    FLAKE_THRESHOLD = float(os.environ.get("FLAKE_THRESHOLD", "0.3"))
+    QUARANTINE_RETRIES = 2
+    
+    # Login circuit breaker, per worker: opens after LOGIN_BREAKER_THRESHOLD consecutive failed
+    # logins (or at once if the login page does not load), then errors authenticated tests
+    # without trying until a re-probe every LOGIN_BREAKER_REPROBE_SECONDS succeeds
+    LOGIN_BREAKER_THRESHOLD = int(os.environ.get("LOGIN_BREAKER_THRESHOLD", "3"))
+    LOGIN_BREAKER_REPROBE_SECONDS = 60
+    
+    # Adaptive timeouts for named waits ("on"/"off"): the p99 of each wait over the last
+    # TIMEOUT_HISTORY_RUNS runs times TIMEOUT_MULTIPLIER, kept between TIMEOUT_FLOOR_MS and the
+    # call site's own timeout, which applies until a wait has TIMEOUT_MIN_SAMPLES samples or
+    # while its p99 is a timed-out sample
+    ADAPTIVE_TIMEOUTS = os.environ.get("ADAPTIVE_TIMEOUTS", "on")
+    TIMEOUT_MULTIPLIER = 3.0
+    TIMEOUT_FLOOR_MS = 1000
+    TIMEOUT_MIN_SAMPLES = 20
+    TIMEOUT_HISTORY_RUNS = 20
+    
+    @classmethod
+    def set_base_url(cls, base_url):
+        """Point every page object at another host, e.g. the local stand-in server"""
+        cls.BASE_URL = base_url.rstrip("/")
+        cls.LOGIN_URL = f"{cls.BASE_URL}/login"
+    
     # Create screenshot directory if it doesn't exist
     @classmethod
     def setup_directories(cls):
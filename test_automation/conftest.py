@@ -97,13 +97,68 @@ import pytest
 import json
 import os
 import base64
+import time
 from datetime import datetime
-from playwright.sync_api import Page
-from utils.helpers import capture_screenshot
+from playwright.sync_api import Page, TimeoutError as PlaywrightTimeoutError
+from utils.helpers import get_worker_id
 from pages.login_page import LoginPage
+from pages.dashboard_page import DashboardPage
+from utils import auth_state
+from utils.duration_store import record_durations
+from utils import result_store
+from config.config import Config
+from utils import waits
+from utils import readiness
+from utils import har_replay
+from utils import route_profiles
+from utils import screenshot_pipeline
+from utils import screenshot_policy
+from utils import tracing
+from utils import step_timing
+from utils import login_health
+from utils.failure_clusters import fingerprint, get_excinfo_signature, get_signature
 
-# Global test results storage
-test_results = []
+def pytest_configure(config):
+    """Point the page objects at --base-url (from pytest-base-url) when one is given"""
+    base_url = config.getoption("base_url", default=None)
+    if base_url:
+        Config.set_base_url(base_url)
+    # Read by the adaptive timeouts, which only learn from runs against the same host and network mode
+    Config.HAR_MODE = config.getoption("har_mode")
+    screenshot_policy.set_policy(config.getoption("screenshot_policy"),
+                                 config.getoption("screenshot_sample_rate"))
+    step_timing.enable(config.getoption("step_timing") == "on")
+
+def pytest_addoption(parser):
+    """Register command line options for this suite"""
+    parser.addoption(
+        "--har-mode", action="store", default=Config.HAR_MODE,
+        choices=["live", "record", "replay"],
+        help="live: use the real host, record: save one HAR per module, replay: serve saved HARs offline"
+    )
+    parser.addoption(
+        "--route-profile", action="store", default=Config.ROUTE_PROFILE,
+        choices=list(route_profiles.ROUTE_PROFILES),
+        help="Resource-blocking profile for tests without a route_profile marker (ignored while recording HARs)"
+    )
+    parser.addoption(
+        "--screenshot-policy", action="store", default=Config.SCREENSHOT_POLICY,
+        choices=screenshot_policy.SCREENSHOT_POLICIES,
+        help="Which test checkpoint screenshots to take; failures are always captured"
+    )
+    parser.addoption(
+        "--screenshot-sample-rate", action="store", type=int, default=Config.SCREENSHOT_SAMPLE_RATE,
+        help="With --screenshot-policy=sample, keep one checkpoint screenshot in N"
+    )
+    parser.addoption(
+        "--trace-mode", action="store", default=Config.TRACE_MODE,
+        choices=tracing.TRACE_MODES,
+        help="Playwright trace per test: on, off, or retain-on-failure (saved only for failed tests)"
+    )
+    parser.addoption(
+        "--step-timing", action="store", default=Config.STEP_TIMING, choices=["on", "off"],
+        help="Record timed spans for page-object methods and Playwright actions"
+    )
 
 @pytest.fixture(scope="session")
 def test_data():
@@ -112,16 +167,127 @@ def test_data():
     with open(data_file, 'r') as f:
         return json.load(f)
 
+@pytest.fixture(scope="session")
+def browser_type_launch_args(browser_type_launch_args):
+    """Honour Config.HEADLESS unless --headed was given, and add the run profile's launch flags"""
+    launch_args = {**browser_type_launch_args}
+    launch_args.setdefault("headless", Config.HEADLESS)
+    if Config.BROWSER_LAUNCH_ARGS:
+        launch_args["args"] = list(launch_args.get("args", [])) + Config.BROWSER_LAUNCH_ARGS
+    return launch_args
+
+@pytest.fixture(scope="session")
+def browser_context_args(browser_context_args, pytestconfig):
+    """Block service workers outside live mode so every request goes through routing"""
+    if pytestconfig.getoption("har_mode") == "live":
+        return browser_context_args
+    return {**browser_context_args, "service_workers": "block"}
+
+@pytest.fixture(scope="module", autouse=True)
+def har_module(request):
+    """Load the module's HAR for replay, or merge the module's recordings once it finishes"""
+    har_mode = request.config.getoption("har_mode")
+    module_name = request.module.__name__.split(".")[-1]
+    
+    if har_mode == "replay":
+        har_path = har_replay.get_har_path(module_name)
+        if not os.path.exists(har_path):
+            pytest.skip(f"No HAR recorded for {module_name} - run with --har-mode=record first")
+        replayer = har_replay.HarReplayer(har_path)
+        yield replayer
+        if replayer.misses:
+            print(f"\n{len(replayer.misses)} requests in {module_name} were not in the HAR and were aborted")
+    elif har_mode == "record":
+        yield None
+        # Parallel workers share modules, so test_runner merges once every worker has finished
+        if not os.environ.get("TEST_WORKER_ID"):
+            har_replay.merge_recordings(module_name)
+    else:
+        yield None
+
+@pytest.fixture(autouse=True)
+def har_network(request, context, har_module):
+    """Record or replay this test's traffic according to --har-mode"""
+    har_mode = request.config.getoption("har_mode")
+    if har_mode == "record":
+        har_replay.start_recording(context, request.module.__name__.split(".")[-1], request.node.name)
+    elif har_mode == "replay":
+        har_module.attach(context)
+
+@pytest.fixture(scope="session")
+def resource_sizes():
+    """Response sizes learned across runs, used to cost the requests a profile blocks"""
+    sizes = route_profiles.learn_sizes_from_hars(route_profiles.load_resource_sizes())
+    yield sizes
+    route_profiles.save_resource_sizes(sizes)
+
+@pytest.fixture(autouse=True)
+def route_profile(request, context, har_network, resource_sizes):
+    """Apply the test's route profile (marker, else --route-profile) to its context"""
+    marker = request.node.get_closest_marker("route_profile")
+    profile_name = marker.args[0] if marker else request.config.getoption("route_profile")
+    # A recording must hold every request: replays serve only what it holds, and
+    # learn_sizes_from_hars costs blocked requests from it
+    if request.config.getoption("har_mode") == "record":
+        profile_name = "full"
+    
+    # Registered after har_network so blocking runs first and falls back to HAR replay
+    blocker = route_profiles.RouteBlocker(profile_name, resource_sizes)
+    route_profiles.learn_resource_sizes(context, resource_sizes)
+    blocker.attach(context)
+    return blocker
+
+@pytest.fixture(autouse=True)
+def trace_recorder(request, context):
+    """Trace the test's context; capture_test_results stops it once the outcome is known"""
+    recorder = tracing.TraceRecorder(context, request.node.name, request.config.getoption("trace_mode"))
+    recorder.start()
+    yield recorder
+    # Only reached with the trace still running if capture_test_results did not stop it
+    recorder.stop(failed=not getattr(getattr(request.node, "rep_call", None), "passed", False))
+
 @pytest.fixture
 def login_page_setup(page: Page):
     """Navigate to login page before each test"""
-    page.goto("https://qa.eyther.ai/login")
-    page.wait_for_load_state("networkidle")
+    login_page = LoginPage(page)
+    login_page.navigate_to_login()
+    login_page.wait_for_page_load()
     return page
 
 @pytest.fixture
-def authenticated_session(page: Page, test_data):
-    """Fixture that provides an authenticated session"""
+def authenticated_session(request, page: Page, test_data):
+    """Fixture that provides an authenticated session, reusing the worker's cached login"""
+    # Errors at once while login is known to be broken instead of waiting out every timeout
+    login_health.check(page, request.node)
+    
+    cached_state = auth_state.load_cached_state()
+    if cached_state:
+        auth_state.apply_state(page.context, cached_state)
+        try:
+            if DashboardPage(page).navigate_with_cached_session():
+                login_health.record_success()
+                return page
+        except PlaywrightTimeoutError:
+            pass
+        
+        # The app bounced the cached session back to login - drop it and log in through the UI
+        print("Cached login state is stale, logging in again")
+        auth_state.invalidate_state()
+    
+    try:
+        log_in(page, test_data)
+    except Exception as e:
+        login_health.record_failure(e)
+        raise
+    login_health.record_success()
+    
+    # Cache the logged-in state for the remaining tests on this worker
+    auth_state.save_state(page.context)
+    
+    return page
+
+def log_in(page: Page, test_data):
+    """Log in through the UI and wait for the dashboard"""
     login_page = LoginPage(page)
     
     # Navigate to login page
@@ -130,16 +296,15 @@ def authenticated_session(page: Page, test_data):
     
     # Perform login
     credentials = test_data["positive_credentials"]
+    readiness.start_navigation(page)
     login_page.login(credentials["email"], credentials["password"])
     
     # Wait for dashboard to load
-    page.wait_for_url("**/hospital-owner-dashboard", timeout=10000)
-    page.wait_for_load_state("networkidle")
-    
-    return page
+    waits.until_url(page, "**/hospital-owner-dashboard", "login_redirect", timeout=10000, optional=False)
+    DashboardPage(page).wait_until_ready()
 
 @pytest.fixture(autouse=True)
-def capture_test_results(request, page: Page):
+def capture_test_results(request, page: Page, route_profile, trace_recorder):
     """Capture comprehensive test results including screenshots and errors"""
     test_start_time = datetime.now()
     screenshot_path = None
@@ -152,40 +317,65 @@ def capture_test_results(request, page: Page):
     # Get test result
     test_passed = True
     error_message = None
+    error_signature = None
+    
+    # A fixture that fails after this one was set up (e.g. the login in authenticated_session)
+    # fails the test in its setup phase, before there is any call report
+    phase_report = getattr(request.node, 'rep_call', None)
+    short_circuited = getattr(request.node, 'login_short_circuited', False)
+    if getattr(request.node, 'rep_setup', None) is not None and request.node.rep_setup.failed:
+        phase_report = request.node.rep_setup
     
-    if hasattr(request.node, 'rep_call'):
-        test_passed = request.node.rep_call.passed
+    if phase_report is not None:
+        test_passed = phase_report.passed
         if not test_passed:
             # Get error details
-            if hasattr(request.node.rep_call, 'longrepr') and request.node.rep_call.longrepr:
-                error_message = str(request.node.rep_call.longrepr)
+            if hasattr(phase_report, 'longrepr') and phase_report.longrepr:
+                error_message = str(phase_report.longrepr)
             else:
                 error_message = "Test failed - no detailed error message available"
+            # Taken from the exception in pytest_runtest_makereport; the text is only a fallback
+            error_signature = getattr(request.node, 'error_signature', None) or get_signature(error_message)
             
-            # Capture screenshot for failed tests
+            # Capture screenshot for failed tests, except those the login circuit stopped before they began
             try:
-                screenshot_filename = f"{request.node.name}_failure_{datetime.now().strftime('%H%M%S')}.png"
-                screenshot_path = capture_screenshot(page, screenshot_filename)
-                print(f"Screenshot captured: {screenshot_path}")
+                if not short_circuited:
+                    screenshot_path = screenshot_policy.capture_failure(page, request.node.name)
+                    print(f"Screenshot captured: {screenshot_path}")
             except Exception as e:
                 print(f"Failed to capture screenshot: {e}")
     
+    # After the failure screenshot, so the trace ends on the failing state
+    trace_path = trace_recorder.stop(failed=not test_passed and not short_circuited)
+    
     # Store test result
     test_result = {
         "test_name": request.node.name,
         "test_file": str(request.node.parent).split("::")[-1] if hasattr(request.node, 'parent') else "unknown",
         "status": "PASSED" if test_passed else "FAILED",
-        "duration": f"{test_duration:.2f}s",
+        "duration": round(test_duration, 3),
         "start_time": test_start_time.strftime("%Y-%m-%d %H:%M:%S"),
         "end_time": test_end_time.strftime("%Y-%m-%d %H:%M:%S"),
         "error_message": error_message,
+        "error_signature": error_signature,
+        "error_fingerprint": fingerprint(error_signature) if error_signature else None,
         "screenshot_path": screenshot_path,
+        "trace_path": trace_path,
         "markers": [mark.name for mark in request.node.iter_markers()],
         "module": get_test_module(request.node.name),
-        "test_id": request.node.nodeid
+        "test_id": request.node.nodeid,
+        "worker_id": get_worker_id(),
+        "base_url": Config.BASE_URL,
+        "har_mode": Config.HAR_MODE,
+        "started_at": test_start_time.timestamp(),
+        "waits": waits.drain_wait_records(),
+        "readiness": readiness.drain_readiness_records(),
+        "network": route_profile.get_summary(),
+        "steps": step_timing.drain_spans()
     }
     
-    test_results.append(test_result)
+    # Stored once the teardown phase is reported and its duration is known
+    request.node.test_result = test_result
 
 def get_test_module(test_name):
     """Determine test module based on test name"""
@@ -198,15 +388,78 @@ def get_test_module(test_name):
     else:
         return 'Other'
 
+# Fixture teardowns in progress: start times keyed by the FixtureDef being finalized
+_teardown_started = {}
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_fixture_setup(fixturedef, request):
+    """Record every fixture's setup as a span of the test that triggered it"""
+    with step_timing.span(fixturedef.argname, "fixture", always=True):
+        yield
+    # Finalizers run last-in first-out, so this one runs right before the fixture's own
+    # teardown and after the teardown of every fixture that depends on it
+    fixturedef.addfinalizer(lambda: _teardown_started.setdefault(
+        id(fixturedef), (time.time() * 1000, time.perf_counter())))
+
+def pytest_fixture_post_finalizer(fixturedef, request):
+    """Record the fixture's teardown as a span, from its marker finalizer to here"""
+    started = _teardown_started.pop(id(fixturedef), None)
+    if started is None:
+        return
+    started_at, started_perf = started
+    step_timing.add_span(fixturedef.argname, "fixture_teardown", started_at,
+                         (time.perf_counter() - started_perf) * 1000)
+
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
 def pytest_runtest_makereport(item, call):
     """Hook to capture test results"""
     outcome = yield
     rep = outcome.get_result()
     setattr(item, f"rep_{rep.when}", rep)
+    
+    # Cluster on the exception and where it was raised, before the longrepr formats it away
+    if rep.failed and call.excinfo is not None and not hasattr(item, "error_signature"):
+        item.error_signature = get_excinfo_signature(call.excinfo)
+    
+    test_result = getattr(item, "test_result", None)
+    if rep.when == "teardown":
+        # Fixture teardowns finish after capture_test_results has built the result
+        teardown_spans = step_timing.drain_spans()
+    if rep.when == "teardown" and test_result is not None:
+        test_result["steps"].extend(teardown_spans)
+        # Phase durations straight from pytest: fixture setup, test body, fixture teardown
+        test_result["phases"] = {
+            phase: round(getattr(item, f"rep_{phase}").duration, 3) if hasattr(item, f"rep_{phase}") else 0.0
+            for phase in ("setup", "call", "teardown")
+        }
+        # Stream to this worker's shard so results survive a crash and other processes
+        result_store.append_result(test_result)
+
+def pytest_sessionstart(session):
+    """Start a serial run from empty result shards"""
+    # A --collect-only run (test_runner.py lists tests with one) runs nothing, so it leaves results alone
+    if session.config.option.collectonly:
+        return
+    # test_runner.py clears the shards itself before it starts parallel workers
+    if not os.environ.get("TEST_WORKER_ID"):
+        result_store.clear_results()
+        screenshot_pipeline.clear_stats()
+        screenshot_pipeline.prune_blobs()
 
 def pytest_sessionfinish(session, exitstatus):
     """Generate comprehensive report at the end of test session"""
+    if session.config.option.collectonly:
+        return
+    # Screenshots are still being written in the background; the report links to them
+    screenshot_pipeline.flush()
+    record_durations(result_store.load_results([get_worker_id()]))
+    
+    # Parallel workers leave their shards for test_runner.py to merge into one report
+    if os.environ.get("TEST_WORKER_ID"):
+        return
+    
+    test_results = result_store.load_results()
+    
     # FIXED: Removed emoji that caused Unicode error
     print("\nGenerating comprehensive test report...")
     
@@ -261,7 +514,7 @@ def generate_simple_fallback_report(test_results):
         </div>
         
         <h3>Test Details</h3>
-        {''.join([f'<div class="test-item {t["status"].lower()}"><strong>{t["test_name"]}</strong><br><span class="{t["status"].lower()}">{t["status"]}</span> - Duration: {t["duration"]}<br>Module: {t["module"]}</div>' for t in test_results])}
+        {''.join([f'<div class="test-item {t["status"].lower()}"><strong>{t["test_name"]}</strong><br><span class="{t["status"].lower()}">{t["status"]}</span> - Duration: {t["duration"]:.2f}s<br>Module: {t["module"]}</div>' for t in test_results])}
     </body>
     </html>
     """
@@ -111,9 +111,21 @@ class ClaimManagementPage:
         self.page_heading.wait_for(state="visible", timeout=10000)'''
 
 
+import re
 from playwright.sync_api import Page, expect
+from utils import waits
+from utils import readiness
+from utils.step_timing import timed_steps
+from config.config import Config
 
+@timed_steps
 class ClaimManagementPage:
+    # Backend data the claims grid must have received before it is usable
+    READY_RESPONSES = readiness.api_response_patterns(Config.CLAIMS_API_PATH)
+    
+    # Whatever renders the claims rows; watched when the claims API cannot be
+    GRID_SELECTOR = "[role='grid'], .ag-grid-wrapper, table"
+    
     def __init__(self, page: Page):
         self.page = page
         
@@ -132,7 +144,7 @@ class ClaimManagementPage:
         self.search_button = page.locator("button:has-text('Search')")
         
         # Grid elements - More flexible approach
-        self.claims_grid = page.locator("[role='grid'], .ag-grid-wrapper, table").first
+        self.claims_grid = page.locator(self.GRID_SELECTOR).first
         self.pagination_info = page.locator("text=/Showing.*entries/")
         self.entries_dropdown = page.locator("//select[@class='border border-gray-300 rounded px-2 py-1 text-sm focus:outline-none focus:ring-2 focus:ring-blue-500 focus:border-blue-500']")
         
@@ -142,6 +154,7 @@ class ClaimManagementPage:
         
         # Claim form elements - More specific selectors
         self.form_heading = page.locator("//h2[normalize-space()='Create New Claim : MAA']")
+        self.any_form_heading = page.locator("h2:has-text('Create New Claim')")
         self.tid_field = page.locator("//input[@class='w-full border border-gray-300 rounded-md px-3 py-1']")
         self.stage_dropdown = page.locator("//select[@class='w-full border border-gray-300 rounded-md px-3 py-1 bg-white']")
         self.upload_area = page.locator("text=/Choose.*file.*drag/")
@@ -151,14 +164,17 @@ class ClaimManagementPage:
 
     def navigate_to_claims(self):
         """Navigate to claim management page"""
-        self.page.goto("https://qa.eyther.ai/claims/hospital")
-        self.page.wait_for_load_state("networkidle")
+        readiness.start_navigation(self.page)
+        self.page.goto(f"{Config.BASE_URL}/claims/hospital")
+        self.wait_for_claims_load()
 
     def search_by_tid(self, tid: str):
         """Search for claim by TID"""
         self.search_box.fill(tid)
-        self.search_button.click()
-        self.page.wait_for_timeout(2000)
+        # Returns once the claims API answers, even when the results are the rows already shown
+        waits.after_response_or_dom_change(self.page, self._get_claims_response(), self.GRID_SELECTOR,
+                                           self.search_button.click, "claims_search_results",
+                                           timeout=5000, replaces_ms=2000)
 
     def clear_search(self):
         """Clear search field"""
@@ -168,19 +184,22 @@ class ClaimManagementPage:
     def open_add_new_dropdown(self):
         """Open Add New dropdown"""
         self.add_new_button.click()
-        self.page.wait_for_timeout(1000)
+        waits.until_element_state(self.maa_option, "add_new_dropdown_open",
+                                  timeout=5000, replaces_ms=1000)
 
     def select_payer_maa(self):
         """Select MAA payer option"""
         self.open_add_new_dropdown()
         self.maa_option.click()
-        self.page.wait_for_timeout(2000)
+        waits.until_element_state(self.form_heading, "maa_form_open",
+                                  timeout=10000, replaces_ms=2000)
 
     def select_payer_rghs(self):
         """Select RGHS payer option"""
         self.open_add_new_dropdown()
         self.rghs_option.click()
-        self.page.wait_for_timeout(2000)
+        waits.until_element_state(self.any_form_heading.first, "rghs_form_open",
+                                  timeout=10000, replaces_ms=2000)
 
     def fill_tid_number(self, tid: str):
         """Fill TID number in form - Fixed strict mode violation"""
@@ -227,10 +246,16 @@ class ClaimManagementPage:
         """Change number of entries per page"""
         # Target pagination dropdown specifically - use nth to avoid strict mode
         pagination_select = self.page.locator("div:has-text('Show:') >> select").nth(0)
-        pagination_select.select_option(entries)
-        self.page.wait_for_timeout(1000)
+        # Returns once the claims API answers with the new page size
+        waits.after_response_or_dom_change(self.page, self._get_claims_response(), self.GRID_SELECTOR,
+                                           lambda: pagination_select.select_option(entries),
+                                           "entries_per_page_changed", timeout=5000, replaces_ms=1000)
+
+    def _get_claims_response(self):
+        """URL pattern of the claims API response, or None when none is declared"""
+        return self.READY_RESPONSES[0] if self.READY_RESPONSES else None
 
     def wait_for_claims_load(self):
         """Wait for claims page to load completely"""
-        self.page.wait_for_load_state("networkidle")
-        self.page_heading.wait_for(state="visible", timeout=10000)
\ No newline at end of file
+        readiness.wait_until_ready(self.page, "Claims", self.READY_RESPONSES,
+                                   self.page_heading, timeout=10000)
\ No newline at end of file
@@ -1,8 +1,16 @@
 
 
 from playwright.sync_api import Page, expect, TimeoutError
+from utils import readiness
+from utils import waits
+from utils.step_timing import timed_steps
+from config.config import Config
 
+@timed_steps
 class DashboardPage:
+    # Backend data the dashboard must have received before it is usable
+    READY_RESPONSES = readiness.api_response_patterns(Config.DASHBOARD_API_PATH)
+    
     def __init__(self, page: Page):
         self.page = page
         
@@ -23,11 +31,31 @@ class DashboardPage:
         # Content elements
         self.loading_message = page.locator("//div[contains(text(), 'Thanks for waiting — we're getting things ready')]")
         self.eyther_logo = page.locator("//h3[normalize-space()='Eyther.']")
+        
+        # Shown instead of the dashboard when the session is no longer valid
+        self.login_email_input = page.locator("//input[@id='email']")
 
     def navigate_to_dashboard(self):
         """Navigate to dashboard page"""
-        self.page.goto("https://qa.eyther.ai/hospital-owner-dashboard")
-        self.page.wait_for_load_state("networkidle")
+        readiness.start_navigation(self.page)
+        self.page.goto(f"{Config.BASE_URL}/hospital-owner-dashboard")
+        self.wait_until_ready()
+
+    def navigate_with_cached_session(self, timeout: int = 10000):
+        """Open the dashboard on a restored session; returns False when the app bounces it to login"""
+        readiness.start_navigation(self.page)
+        self.page.goto(f"{Config.BASE_URL}/hospital-owner-dashboard")
+        # Settle the bounce first, so a stale session is never waited on as a slow dashboard load
+        self.dashboard_heading.or_(self.login_email_input).first.wait_for(timeout=timeout)
+        if "/hospital-owner-dashboard" not in self.page.url or self.login_email_input.is_visible():
+            return False
+        self.wait_until_ready()
+        return True
+
+    def wait_until_ready(self, timeout: int = 10000):
+        """Wait until the dashboard data has arrived and its heading has rendered"""
+        readiness.wait_until_ready(self.page, "Dashboard", self.READY_RESPONSES,
+                                   self.dashboard_heading, timeout=timeout)
 
     def navigate_to_claim_management(self):
         """Navigate to claim management page"""
@@ -45,7 +73,7 @@ class DashboardPage:
                 self.logout_button_alt.click()
             
             # Wait for navigation
-            self.page.wait_for_url("**/login", timeout=10000)
+            waits.until_url(self.page, "**/login", "logout_redirect", timeout=10000, optional=False)
             
         except TimeoutError:
             # If standard selectors fail, try JavaScript
@@ -58,7 +86,7 @@ class DashboardPage:
             """)
             # Wait for navigation after JS click
             try:
-                self.page.wait_for_url("**/login", timeout=10000)
+                waits.until_url(self.page, "**/login", "logout_redirect", timeout=10000, optional=False)
             except TimeoutError:
                 raise Exception("Logout failed - could not navigate to login page")
 
@@ -86,12 +114,9 @@ class DashboardPage:
 
     def wait_for_dashboard_load(self):
         """Wait for dashboard to load completely with improved error handling"""
-        # Wait for network to be idle
-        self.page.wait_for_load_state("networkidle")
-        
-        # Wait for dashboard heading with timeout
+        # Wait for dashboard data and heading with timeout
         try:
-            self.dashboard_heading.wait_for(state="visible", timeout=10000)
+            self.wait_until_ready(timeout=10000)
         except TimeoutError:
             # If heading not found, check if we're on the right page
             if "/hospital-owner-dashboard" not in self.page.url:
@@ -113,7 +138,8 @@ class DashboardPage:
             # Wait for loading message to appear (if it does)
             if self.loading_message.is_visible(timeout=2000):
                 # Then wait for it to disappear
-                self.loading_message.wait_for(state="hidden", timeout=15000)
+                waits.until_element_state(self.loading_message, "loading_message_hidden", state="hidden",
+                                          timeout=15000, optional=False)
         except TimeoutError:
             # Loading message might not appear or might already be gone
             pass
@@ -1,6 +1,14 @@
 from playwright.sync_api import Page, expect
+from utils import waits
+from utils import readiness
+from utils.step_timing import timed_steps
+from config.config import Config
 
+@timed_steps
 class LoginPage:
+    # The login form is static, so rendering the email field is all it needs
+    READY_RESPONSES = []
+    
     def __init__(self, page: Page):
         self.page = page
         self.email_input = page.locator("//input[@id='email']")
@@ -11,7 +19,8 @@ class LoginPage:
         
     def navigate_to_login(self):
         """Navigate to login page"""
-        self.page.goto("https://qa.eyther.ai/login")
+        readiness.start_navigation(self.page)
+        self.page.goto(Config.LOGIN_URL)
         
     def enter_email(self, email: str):
         """Enter email in email field"""
@@ -41,8 +50,18 @@ class LoginPage:
         
     def is_login_successful(self):
         """Check if login was successful by URL change or dashboard elements"""
-        return self.page.url != "https://qa.eyther.ai/login"
+        return self.page.url != Config.LOGIN_URL
+        
+    def wait_for_login_outcome(self, timeout: int = 5000):
+        """Wait until a login attempt resolves: redirect, error shown or form rejected by validation"""
+        waits.until_condition(self.page, """() => {
+            const shown = (selector) => Array.from(document.querySelectorAll(selector))
+                .some(el => el.offsetParent !== null);
+            return !window.location.pathname.startsWith('/login')
+                || shown('form :invalid')
+                || shown('[role="alert"], [id="5"]');
+        }""", "login_outcome", timeout=timeout, replaces_ms=2000)
         
     def wait_for_page_load(self):
         """Wait for page to load completely"""
-        self.page.wait_for_load_state("networkidle")
\ No newline at end of file
+        readiness.wait_until_ready(self.page, "Login", self.READY_RESPONSES, self.email_input)
\ No newline at end of file
@@ -0,0 +1,368 @@
+"""Local stand-in for the Eyther login, dashboard and claims screens.
+
+Serves the same DOM contracts the page objects rely on, so the suite can be
+benchmarked and parallelized without load on qa.eyther.ai:
+
+    python -m standin.server --port 8765 --latency-ms 150 --claims 500
+    DASHBOARD_API_PATH=/api/dashboard CLAIMS_API_PATH=/api/claims pytest --base-url http://127.0.0.1:8765
+"""
+import os
+import json
+import time
+import random
+import secrets
+import argparse
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from http.cookies import SimpleCookie
+from urllib.parse import urlsplit, parse_qs
+
+DATA_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'test_data.json')
+
+PAGE_TITLE = "Eyther - Accelerate Claim Processing with AI"
+
+# Where the dashboard and claims screens below fetch their data; the readiness waits key on these
+DASHBOARD_API_PATH = "/api/dashboard"
+CLAIMS_API_PATH = "/api/claims"
+
+LOGIN_HTML = """<!DOCTYPE html>
+<html><head><meta charset="UTF-8"><title>{title}</title></head>
+<body>
+  <h2>Eyther Login</h2>
+  <form id="login-form" novalidate>
+    <label for="email">Email</label>
+    <input id="email" type="email" autocomplete="username">
+    <label for="password">Password</label>
+    <input id="password" type="password" autocomplete="current-password">
+    <div id="5" role="alert" style="display: none"></div>
+    <button type="submit">Log in</button>
+  </form>
+  <a href="/forgot-password">Forgot Password?</a>
+  <p>Protected by SSL encryption</p>
+  <script>
+    document.getElementById('login-form').addEventListener('submit', async (event) => {{
+      event.preventDefault();
+      const error = document.getElementById('5');
+      const response = await fetch('/api/auth/login', {{
+        method: 'POST',
+        headers: {{'Content-Type': 'application/json'}},
+        body: JSON.stringify({{
+          email: document.getElementById('email').value,
+          password: document.getElementById('password').value
+        }})
+      }});
+      const result = await response.json();
+      if (response.ok) {{
+        localStorage.setItem('token', result.token);
+        window.location.href = '/hospital-owner-dashboard';
+      }} else {{
+        error.textContent = result.error;
+        error.style.display = 'block';
+      }}
+    }});
+  </script>
+</body></html>
+"""
+
+NAV_HTML = """
+  <h3>Eyther.</h3>
+  <nav>
+    <a href="/hospital-owner-dashboard">Dashboard</a>
+    <a href="/claims/hospital">Claim Management</a>
+    <button type="button" id="logout">Logout</button>
+  </nav>
+  <script>
+    document.getElementById('logout').addEventListener('click', async () => {{
+      await fetch('/api/auth/logout', {{method: 'POST'}});
+      localStorage.removeItem('token');
+      window.location.href = '/login';
+    }});
+  </script>
+"""
+
+DASHBOARD_HTML = """<!DOCTYPE html>
+<html><head><meta charset="UTF-8"><title>{title}</title></head>
+<body>
+  {nav}
+  <main id="dashboard">
+    <div>Thanks for waiting — we're getting things ready</div>
+  </main>
+  <script>
+    fetch('/api/dashboard').then(response => response.json()).then(data => {{
+      document.getElementById('dashboard').innerHTML = `
+        <h1>Hospital Owner Dashboard</h1>
+        <div class="text-[16px] font-roboto font-medium">Welcome, ${{data.name}}</div>
+        <div>${{data.email}}</div>
+        <p>${{data.total_claims}} claims</p>`;
+    }});
+  </script>
+</body></html>
+"""
+
+CLAIMS_HTML = """<!DOCTYPE html>
+<html><head><meta charset="UTF-8"><title>{title}</title></head>
+<body>
+  {nav}
+  <h1>New Claim Submission</h1>
+  <div>
+    <button type="button">Payer</button>
+    <button type="button">Status</button>
+    <span class="truncate">Date Range</span>
+    <button type="button">Select Columns</button>
+    <button type="button" id="add-new">Add New</button>
+    <div id="payer-menu" style="display: none">
+      <button type="button" data-payer="MAA">MAA</button>
+      <button type="button" data-payer="RGHS">RGHS</button>
+    </div>
+  </div>
+  <div>
+    <input id="search" placeholder="Search by TID">
+    <button type="button" id="search-button">Search</button>
+  </div>
+  <table role="grid">
+    <thead><tr>
+      <th>ClaimID</th><th>Reference ID</th><th>Patient</th><th>Payer</th>
+      <th>Stage</th><th>Verification Status</th><th>Action</th>
+    </tr></thead>
+    <tbody id="rows"></tbody>
+  </table>
+  <div>
+    <span id="pagination-info"></span>
+    <div>Show:
+      <select id="page-size" class="border border-gray-300 rounded px-2 py-1 text-sm focus:outline-none focus:ring-2 focus:ring-blue-500 focus:border-blue-500">
+        <option value="10">10</option><option value="25">25</option><option value="50">50</option>
+      </select>
+    </div>
+  </div>
+  <div id="claim-form" style="display: none">
+    <h2 id="form-heading"></h2>
+    <div>TID Number
+      <input type="text" class="w-full border border-gray-300 rounded-md px-3 py-1">
+    </div>
+    <div>Stage
+      <select class="w-full border border-gray-300 rounded-md px-3 py-1 bg-white">
+        <option value="PRE_AUTH">Pre Auth</option>
+        <option value="SETTLEMENT">Discharge</option>
+      </select>
+    </div>
+    <h4>Upload Documents</h4>
+    <div class="border-3 border-dashed border-[#CBD0DC] rounded-4xl p-6 flex flex-col items-center justify-center cursor-pointer hover:bg-gray-50">
+      <p>Choose a file or drag &amp; drop it here</p>
+      <p>PDF, JPG, PNG formats, up to 10MB</p>
+    </div>
+    <button type="button" id="submit-claim">Submit</button>
+    <button type="button" id="cancel-claim">Cancel</button>
+  </div>
+  <script>
+    let page = 1;
+    const render = async () => {{
+      const size = document.getElementById('page-size').value;
+      const tid = document.getElementById('search').value;
+      const response = await fetch(`/api/claims?page=${{page}}&size=${{size}}&tid=${{encodeURIComponent(tid)}}`);
+      const data = await response.json();
+      document.getElementById('rows').innerHTML = data.claims.map(claim => `
+        <tr><td>${{claim.claim_id}}</td><td>${{claim.reference_id}}</td><td>${{claim.patient}}</td>
+        <td>${{claim.payer}}</td><td>${{claim.stage}}</td><td>${{claim.status}}</td><td><a href="#">View</a></td></tr>`
+      ).join('');
+      const first = data.total ? (data.page - 1) * data.size + 1 : 0;
+      const last = Math.min(data.page * data.size, data.total);
+      document.getElementById('pagination-info').textContent = `Showing ${{first}} to ${{last}} of ${{data.total}} entries`;
+    }};
+    const closeForm = () => {{ document.getElementById('claim-form').style.display = 'none'; }};
+    document.getElementById('search-button').addEventListener('click', () => {{ page = 1; render(); }});
+    document.getElementById('page-size').addEventListener('change', () => {{ page = 1; render(); }});
+    document.getElementById('add-new').addEventListener('click', () => {{
+      document.getElementById('payer-menu').style.display = 'block';
+    }});
+    document.querySelectorAll('[data-payer]').forEach(button => button.addEventListener('click', () => {{
+      document.getElementById('payer-menu').style.display = 'none';
+      document.getElementById('form-heading').textContent = `Create New Claim : ${{button.dataset.payer}}`;
+      document.getElementById('claim-form').style.display = 'block';
+    }}));
+    document.getElementById('cancel-claim').addEventListener('click', closeForm);
+    document.getElementById('submit-claim').addEventListener('click', closeForm);
+    render();
+  </script>
+</body></html>
+"""
+
+def build_claims(count: int, sample_claim: dict):
+    """Build a deterministic claims dataset that starts with the suite's sample claim"""
+    rng = random.Random(42)
+    claims = [{
+        "claim_id": sample_claim["claim_id"],
+        "reference_id": "REF-000913",
+        "patient": sample_claim["patient_name"],
+        "payer": sample_claim["payer"],
+        "stage": sample_claim["stage"],
+        "status": sample_claim["status"]
+    }]
+    for index in range(1, count):
+        claim_id = str(1000 + index)
+        claims.append({
+            "claim_id": claim_id,
+            "reference_id": f"REF-{claim_id.zfill(6)}",
+            "patient": f"Patient {index}",
+            "payer": rng.choice(["MAA", "RGHS"]),
+            "stage": rng.choice(["Pre-Auth", "Discharge"]),
+            "status": rng.choice(["Pending", "Verified", "Rejected"])
+        })
+    return claims
+
+class StandinHandler(BaseHTTPRequestHandler):
+    """Request handler; server-wide settings live on self.server"""
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path in ("/", "/login"):
+            self.send_html(LOGIN_HTML.format(title=PAGE_TITLE))
+        elif url.path == "/hospital-owner-dashboard":
+            if self.require_session():
+                self.send_html(DASHBOARD_HTML.format(title=PAGE_TITLE, nav=NAV_HTML.format()))
+        elif url.path == "/claims/hospital":
+            if self.require_session():
+                self.send_html(CLAIMS_HTML.format(title=PAGE_TITLE, nav=NAV_HTML.format()))
+        elif url.path == DASHBOARD_API_PATH:
+            self.api_dashboard()
+        elif url.path == CLAIMS_API_PATH:
+            self.api_claims(parse_qs(url.query))
+        else:
+            self.send_json({"error": "Not found"}, status=404)
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        if url.path == "/api/auth/login":
+            self.api_login()
+        elif url.path == "/api/auth/logout":
+            self.api_logout()
+        else:
+            self.send_json({"error": "Not found"}, status=404)
+
+    def api_login(self):
+        self.simulate_latency()
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            body = {}
+
+        credentials = self.server.credentials
+        if body.get("email") != credentials["email"] or body.get("password") != credentials["password"]:
+            self.send_json({"error": "Invalid credentials"}, status=401)
+            return
+
+        token = secrets.token_hex(16)
+        self.server.sessions.add(token)
+        self.send_json({"token": token}, cookies={"session": token})
+
+    def api_logout(self):
+        token = self.get_session_token()
+        self.server.sessions.discard(token)
+        self.send_json({"ok": True}, cookies={"session": ""})
+
+    def api_dashboard(self):
+        if self.get_session_token() not in self.server.sessions:
+            self.send_json({"error": "Unauthorized"}, status=401)
+            return
+        self.simulate_latency()
+        self.send_json({
+            "name": "Hospital Owner",
+            "email": self.server.credentials["email"],
+            "total_claims": len(self.server.claims)
+        })
+
+    def api_claims(self, query: dict):
+        if self.get_session_token() not in self.server.sessions:
+            self.send_json({"error": "Unauthorized"}, status=401)
+            return
+        self.simulate_latency()
+        page = max(int(query.get("page", ["1"])[0] or 1), 1)
+        size = max(int(query.get("size", ["10"])[0] or 10), 1)
+        tid = query.get("tid", [""])[0].strip()
+
+        claims = self.server.claims
+        if tid:
+            claims = [claim for claim in claims if tid in claim["claim_id"]]
+        start = (page - 1) * size
+        self.send_json({
+            "claims": claims[start:start + size],
+            "page": page,
+            "size": size,
+            "total": len(claims)
+        })
+
+    def simulate_latency(self):
+        """Delay API responses by the configured latency (with up to 20% jitter)"""
+        latency_ms = self.server.latency_ms
+        if latency_ms > 0:
+            time.sleep(latency_ms * random.uniform(0.8, 1.2) / 1000)
+
+    def get_session_token(self):
+        cookie = SimpleCookie(self.headers.get("Cookie", ""))
+        return cookie["session"].value if "session" in cookie else None
+
+    def require_session(self):
+        """Redirect to login, like the real app, when there is no valid session"""
+        if self.get_session_token() in self.server.sessions:
+            return True
+        self.send_response(302)
+        self.send_header("Location", "/login")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+        return False
+
+    def send_html(self, html: str):
+        body = html.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_json(self, data, status: int = 200, cookies: dict = None):
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (cookies or {}).items():
+            max_age = "" if value else "; Max-Age=0"
+            self.send_header("Set-Cookie", f"{name}={value}; Path=/; HttpOnly; SameSite=Lax{max_age}")
+        self.end_headers()
+        self.wfile.write(body)
+
+def create_server(host: str = "127.0.0.1", port: int = 8765, latency_ms: int = 0,
+                  claims: int = 100, verbose: bool = False):
+    """Create the stand-in server; port 0 picks a free port"""
+    with open(DATA_FILE, 'r') as f:
+        test_data = json.load(f)
+
+    server = ThreadingHTTPServer((host, port), StandinHandler)
+    server.latency_ms = latency_ms
+    server.verbose = verbose
+    server.credentials = test_data["positive_credentials"]
+    server.claims = build_claims(claims, test_data["claim_management_data"]["sample_claims"])
+    server.sessions = set()
+    return server
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local stand-in for the Eyther QA screens")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=int, default=0, help="Delay added to every API response")
+    parser.add_argument("--claims", type=int, default=100, help="Number of claims in the dataset")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args()
+
+    server = create_server(args.host, args.port, args.latency_ms, args.claims, args.verbose)
+    host, port = server.server_address[:2]
+    print(f"Stand-in server running at http://{host}:{port} "
+          f"({len(server.claims)} claims, {args.latency_ms} ms latency)", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
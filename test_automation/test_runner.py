@@ -1,12 +1,50 @@
 
 import subprocess
+import signal
 import sys
 import os
 import json
 import re
+import time
+import heapq
+import argparse
 from datetime import datetime
+from config.config import Config
+from utils.duration_store import load_durations
+from utils import result_store
+from utils import screenshot_pipeline
+from utils import run_profiles
+from utils import route_profiles
+from utils.screenshot_policy import SCREENSHOT_POLICIES
+from utils import run_history
+from utils import har_replay
 
-def run_tests(test_type="all"):
+BASE_PYTEST_ARGS = ["-v"]
+
+# Worker ids of the quarantine lane are this prefix plus the attempt number
+QUARANTINE_WORKER_PREFIX = "quarantine"
+
+# Tests with no recorded duration are weighted as this many seconds when nothing is known
+DEFAULT_TEST_DURATION = 10.0
+
+def get_selection_args(test_type):
+    """Translate a test type into pytest selection arguments"""
+    if test_type == "login":
+        return ["tests/test_login.py"]
+    elif test_type == "dashboard":
+        return ["tests/test_dashboard.py"]
+    elif test_type == "claims":
+        return ["tests/test_claim_management.py"]
+    elif test_type in ("positive", "negative", "high", "medium", "smoke"):
+        return ["-m", test_type]
+    elif test_type == "all":
+        return ["tests/"]
+    return None
+
+def run_tests(test_type="all", workers=1, har_mode=None, base_url=None, route_profile=None,
+              single_file_report=False, screenshot_policy=None, screenshot_sample_rate=None,
+              profile=None, quarantine=False, failed_first=False, only_failed=False,
+              fail_fast_after=None):
     """Enhanced test runner with comprehensive reporting"""
 
     # Ensure we're in the right directory
@@ -14,37 +52,79 @@ def run_tests(test_type="all"):
         print("Error: tests directory not found. Run from project root directory.")
         return False
 
+    # Workers and the parallel merge both read the report mode from the environment
+    if single_file_report:
+        os.environ["REPORT_ASSET_MODE"] = "single-file"
+        Config.REPORT_ASSET_MODE = "single-file"
+
     # Create necessary directories
     os.makedirs("reports", exist_ok=True)
     os.makedirs("screenshots", exist_ok=True)
 
-    # Base command - FIXED: Removed problematic JSON report arguments
-    base_cmd = ["pytest", "-v", "--headed", "--screenshot=on"]
-
-    # Test type selection
-    if test_type == "login":
-        base_cmd.extend(["tests/test_login.py"])
-    elif test_type == "dashboard":
-        base_cmd.extend(["tests/test_dashboard.py"])
-    elif test_type == "claims":
-        base_cmd.extend(["tests/test_claim_management.py"])
-    elif test_type == "positive":
-        base_cmd.extend(["-m", "positive"])
-    elif test_type == "negative":
-        base_cmd.extend(["-m", "negative"])
-    elif test_type == "high":
-        base_cmd.extend(["-m", "high"])
-    elif test_type == "medium":
-        base_cmd.extend(["-m", "medium"])
-    elif test_type == "smoke":
-        base_cmd.extend(["-m", "smoke"])
-    elif test_type == "all":
-        base_cmd.extend(["tests/"])
-    else:
+    selection_args = get_selection_args(test_type)
+    if selection_args is None:
         print("Invalid test type. Available options:")
         print_test_options()
         return False
 
+    # The profile sets the defaults; the explicit options below override it
+    profile = profile or Config.RUN_PROFILE
+    run_profiles.apply_environment(profile)
+    pytest_args = list(BASE_PYTEST_ARGS) + run_profiles.get_pytest_args(profile)
+    if har_mode:
+        pytest_args.append(f"--har-mode={har_mode}")
+    if base_url:
+        pytest_args.extend(["--base-url", base_url])
+    if route_profile:
+        pytest_args.append(f"--route-profile={route_profile}")
+    if screenshot_policy:
+        pytest_args.append(f"--screenshot-policy={screenshot_policy}")
+    if screenshot_sample_rate:
+        pytest_args.append(f"--screenshot-sample-rate={screenshot_sample_rate}")
+
+    prioritized = set()
+    if failed_first or only_failed:
+        last_failed = run_history.get_last_failed_tests()
+        test_ids = collect_test_ids(selection_args)
+        failed_ids = [test_id for test_id in test_ids if test_id in last_failed]
+        if only_failed:
+            if not failed_ids:
+                print(f"✅ No {test_type} tests failed in the last run - nothing to rerun")
+                return True
+            print(f"🔁 Rerunning the {len(failed_ids)} tests that failed in the last run")
+            selection_args = failed_ids
+        else:
+            print(f"🔁 Running the {len(failed_ids)} tests that failed in the last run first")
+            # pytest runs node ids in the order given; parallel shards are reordered instead
+            selection_args = failed_ids + [test_id for test_id in test_ids if test_id not in last_failed]
+            prioritized = set(failed_ids)
+
+    print(f"⚙️ Run profile: {profile}")
+    run_start = time.time()
+    # Quarantined tests need a lane of their own, which only the parallel runner has
+    quarantined = run_history.get_quarantined_tests() if quarantine else set()
+    if quarantine:
+        print(f"🚧 {len(quarantined)} tests quarantined by flake score (threshold {Config.FLAKE_THRESHOLD})")
+    if workers > 1 or quarantined:
+        success = run_parallel_tests(test_type, selection_args, workers, pytest_args, quarantined,
+                                     prioritized, fail_fast_after)
+    else:
+        # Parallel runs share one fail-fast budget across workers instead of --maxfail per worker
+        if fail_fast_after:
+            pytest_args.append(f"--maxfail={fail_fast_after}")
+        success = run_serial_tests(test_type, selection_args, pytest_args)
+
+    run_profiles.record_profile_timing(profile, test_type, workers, len(result_store.load_results()),
+                                       time.time() - run_start)
+    print("\n⏱️ Cost per profile (worker seconds per test, all recorded runs):")
+    run_profiles.print_profile_timings()
+    return success
+
+def run_serial_tests(test_type, selection_args, pytest_args):
+    """Run the selected tests in a single pytest process"""
+    # Base command - FIXED: Removed problematic JSON report arguments
+    base_cmd = ["pytest"] + pytest_args + selection_args
+
     try:
         print(f"🚀 Running {test_type} tests...")
         print(f"Command: {' '.join(base_cmd)}")
@@ -80,6 +160,216 @@ def run_tests(test_type="all"):
         print(f"❌ Error running tests: {e}")
         return False
 
+def collect_test_ids(selection_args):
+    """Collect the node ids pytest would run for the given selection"""
+    cmd = ["pytest", "--collect-only", "-q"] + selection_args
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    return [line.strip() for line in result.stdout.splitlines() if "::" in line]
+
+def shard_tests(test_ids, durations, workers):
+    """Split tests across workers by past duration, longest first, onto the least loaded worker"""
+    known = [durations[test_id] for test_id in test_ids if test_id in durations]
+    default_duration = sum(known) / len(known) if known else DEFAULT_TEST_DURATION
+
+    weighted_tests = sorted(
+        ((durations.get(test_id, default_duration), test_id) for test_id in test_ids),
+        reverse=True
+    )
+
+    shards = [{"tests": [], "expected_duration": 0.0} for _ in range(workers)]
+    worker_loads = [(0.0, index) for index in range(workers)]
+    for duration, test_id in weighted_tests:
+        load, index = heapq.heappop(worker_loads)
+        shards[index]["tests"].append(test_id)
+        shards[index]["expected_duration"] = load + duration
+        heapq.heappush(worker_loads, (load + duration, index))
+
+    return [shard for shard in shards if shard["tests"]]
+
+def start_worker(worker_id, test_ids, pytest_args):
+    """Start one pytest worker process on the given tests, logging to its own file"""
+    log_path = os.path.join(Config.WORKER_RESULTS_DIR, f"{worker_id}.log")
+    log_file = open(log_path, 'w', encoding='utf-8')
+    cmd = ["pytest"] + pytest_args + test_ids
+    process = subprocess.Popen(
+        cmd, stdout=log_file, stderr=subprocess.STDOUT, text=True,
+        env=dict(os.environ, TEST_WORKER_ID=worker_id)
+    )
+    return {
+        "worker_id": worker_id,
+        "process": process,
+        "log_file": log_file,
+        "log_path": log_path
+    }
+
+def get_failed_test_ids(worker_id):
+    """Ids of the tests a finished worker recorded as failed"""
+    results = result_store.load_results([worker_id])
+    return [result['test_id'] for result in results if result['status'] == 'FAILED']
+
+def interrupt_worker(process):
+    """Stop a worker like Ctrl+C would, so pytest still runs teardown and sessionfinish"""
+    if os.name == "nt":
+        # Windows has no SIGINT for a single child process
+        process.terminate()
+    else:
+        process.send_signal(signal.SIGINT)
+
+def run_parallel_tests(test_type, selection_args, workers, pytest_args, quarantined=(), prioritized=(),
+                       fail_fast_after=None):
+    """Run the selected tests across several pytest worker processes"""
+    test_ids = collect_test_ids(selection_args)
+    if not test_ids:
+        print(f"❌ No tests collected for {test_type}")
+        return False
+
+    # Flaky tests go to a lane of their own, so they neither fail nor hold up the main lane
+    quarantine_ids = [test_id for test_id in test_ids if test_id in quarantined]
+    main_ids = [test_id for test_id in test_ids if test_id not in quarantined]
+    shards = shard_tests(main_ids, load_durations(), workers)
+    for shard in shards:
+        # Stable sort: prioritized tests move to the front, the rest keep their balanced order
+        shard["tests"].sort(key=lambda test_id: test_id not in prioritized)
+
+    # Clear results and logs left over from an earlier run
+    result_store.clear_results()
+    screenshot_pipeline.clear_stats()
+    screenshot_pipeline.prune_blobs()
+    os.makedirs(Config.WORKER_RESULTS_DIR, exist_ok=True)
+    for filename in os.listdir(Config.WORKER_RESULTS_DIR):
+        os.remove(os.path.join(Config.WORKER_RESULTS_DIR, filename))
+
+    print(f"🚀 Running {len(main_ids)} {test_type} tests on {len(shards)} workers...")
+    print("="*70)
+
+    run_start = time.time()
+    running = []
+    for index, shard in enumerate(shards):
+        worker = start_worker(f"worker{index}", shard["tests"], pytest_args)
+        worker["shard"] = shard
+        running.append(worker)
+        print(f"  {worker['worker_id']}: {len(shard['tests'])} tests, expected {shard['expected_duration']:.1f}s")
+
+    quarantine_lane = []
+    if quarantine_ids:
+        quarantine_lane.append(start_worker(f"{QUARANTINE_WORKER_PREFIX}0", quarantine_ids, pytest_args))
+        print(f"  {QUARANTINE_WORKER_PREFIX}: {len(quarantine_ids)} flaky tests, "
+              f"failures retried up to {Config.QUARANTINE_RETRIES} times")
+
+    # Poll so every worker's own finish time is known, not just the slowest one's
+    pending = running + quarantine_lane
+    budget_spent = False
+    while pending:
+        if fail_fast_after and not budget_spent:
+            failures = sum(len(get_failed_test_ids(worker["worker_id"])) for worker in running)
+            if failures >= fail_fast_after:
+                print(f"💥 {failures} failures reached the fail-fast budget of {fail_fast_after} - stopping workers")
+                budget_spent = True
+                for worker in pending:
+                    interrupt_worker(worker["process"])
+        for worker in list(pending):
+            if worker["process"].poll() is not None:
+                worker["duration"] = time.time() - run_start
+                worker["log_file"].close()
+                pending.remove(worker)
+                if worker in quarantine_lane:
+                    # Rerun only what failed, until it passes or the retries run out
+                    attempt = len(quarantine_lane)
+                    failed_ids = get_failed_test_ids(worker["worker_id"])
+                    if failed_ids and attempt <= Config.QUARANTINE_RETRIES and not budget_spent:
+                        retry = start_worker(f"{QUARANTINE_WORKER_PREFIX}{attempt}", failed_ids, pytest_args)
+                        quarantine_lane.append(retry)
+                        pending.append(retry)
+        time.sleep(0.2)
+    wall_time = time.time() - run_start
+
+    for worker in running + quarantine_lane:
+        print("\n" + "="*70)
+        print(f"WORKER OUTPUT - {worker['worker_id']}")
+        print("="*70)
+        with open(worker["log_path"], 'r', encoding='utf-8') as f:
+            print(f.read())
+
+    exit_codes = [worker["process"].returncode for worker in running]
+
+    print("\n" + "="*70)
+    print(f"PARALLEL EXECUTION COMPLETED - {test_type.upper()}")
+    print("="*70)
+    print(f"{'Worker':<10}{'Tests':>7}{'Expected':>11}{'Actual':>10}{'Exit':>6}")
+    for worker in running:
+        print(f"{worker['worker_id']:<10}{len(worker['shard']['tests']):>7}"
+              f"{worker['shard']['expected_duration']:>10.1f}s{worker['duration']:>9.1f}s"
+              f"{worker['process'].returncode:>6}")
+    if quarantine_lane:
+        still_failing = get_failed_test_ids(quarantine_lane[-1]["worker_id"])
+        print(f"Quarantine lane: {len(quarantine_ids) - len(still_failing)} of {len(quarantine_ids)} passed "
+              f"in {len(quarantine_lane)} attempts, finished at {quarantine_lane[-1]['duration']:.1f}s "
+              f"(does not affect the exit code)")
+    print(f"Wall time: {wall_time:.1f}s - overall exit code: {max(exit_codes, default=0)}")
+
+    # Record mode leaves per-worker recordings, merged only now that no worker is still writing
+    har_replay.merge_all_recordings()
+    merge_worker_results([worker["worker_id"] for worker in running + quarantine_lane])
+
+    return all(code == 0 for code in exit_codes)
+
+def merge_worker_results(worker_ids):
+    """Combine every worker's result shard into one comprehensive report"""
+    # Shards are written result by result, so a crashed worker still contributes what it finished
+    merged_results = combine_quarantine_attempts(result_store.load_results(worker_ids))
+    if not merged_results:
+        print("⚠️ No results were recorded by any worker")
+        return None
+
+    # Import here so plotly detection only runs when a report is actually built
+    from utils.comprehensive_report_generator import generate_comprehensive_report
+    report_path = generate_comprehensive_report(merged_results)
+
+    print("\n" + "="*70)
+    print("📊 REPORTS GENERATED:")
+    print("="*70)
+    print(f"✅ Comprehensive HTML Report: {report_path}")
+    print(f"📝 Worker logs: {Config.WORKER_RESULTS_DIR}/ directory")
+    print("="*70)
+    return report_path
+
+def combine_quarantine_attempts(results):
+    """Keep only the last attempt of each quarantined test, noting how many it took.
+
+    The attempt count goes into the run history, where a pass after retries counts as a flip.
+    """
+    # Results are in start order, so a test's last attempt is its last result
+    last_attempts = {}
+    for result in results:
+        if result.get('worker_id', '').startswith(QUARANTINE_WORKER_PREFIX):
+            previous = last_attempts.get(result['test_id'])
+            result['quarantined'] = True
+            result['attempts'] = previous['attempts'] + 1 if previous else 1
+            last_attempts[result['test_id']] = result
+    return [
+        result for result in results
+        if not result.get('quarantined') or last_attempts[result['test_id']] is result
+    ]
+
+def start_standin_server():
+    """Start the local stand-in server on a free port and return the process and its URL"""
+    process = subprocess.Popen(
+        [sys.executable, "-m", "standin.server", "--port", "0"],
+        stdout=subprocess.PIPE, text=True
+    )
+    # The server announces its address on the first line it prints
+    banner = process.stdout.readline()
+    match = re.search(r"(http://\S+)", banner)
+    if not match:
+        process.terminate()
+        raise RuntimeError(f"Stand-in server failed to start: {banner.strip()}")
+    print(f"🧪 {banner.strip()}")
+    # Workers inherit these, so the pages wait for the stand-in's data responses
+    from standin.server import DASHBOARD_API_PATH, CLAIMS_API_PATH
+    os.environ.setdefault("DASHBOARD_API_PATH", DASHBOARD_API_PATH)
+    os.environ.setdefault("CLAIMS_API_PATH", CLAIMS_API_PATH)
+    return process, match.group(1)
+
 def print_test_options():
     """Display available test execution options"""
     print("\n=== AVAILABLE TEST OPTIONS ===")
@@ -92,13 +382,59 @@ def print_test_options():
     print("  medium     - Medium priority tests")
     print("  smoke      - Smoke tests")
     print("  all        - All tests (default)")
+    print("\n=== OPTIONS ===")
+    print("  --workers N  - Run tests in N parallel pytest processes, balanced by past durations")
+    print("  --har-mode M - live (default), record one HAR per module, or replay HARs offline")
+    print("  --base-url U - Run against another host instead of https://qa.eyther.ai")
+    print("  --standin    - Start the local stand-in server (standin/server.py) and run against it")
+    print("  --route-profile P - full, no-media or minimal resource blocking for unmarked tests")
+    print("  --profile P  - Run profile: ci-fast, debug (default) or forensics")
+    print("  --screenshot-policy P - always (default), on-failure, sample or on-change checkpoint screenshots")
+    print("  --screenshot-sample-rate N - With the sample policy, keep one checkpoint screenshot in N")
+    print("  --failed-first - Run the tests that failed in the last run before the rest")
+    print("  --only-failed - Rerun only the tests that failed in the last run")
+    print("  --fail-fast-after N - Stop the run once N tests have failed, across all workers")
+    print("  --quarantine - Run tests at or above the flake score threshold in a separate, retried lane")
+    print("  --single-file-report - Inline screenshots in the report (for emailing) instead of reports/assets/")
 
 if __name__ == "__main__":
-    test_type = sys.argv[1] if len(sys.argv) > 1 else "all"
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("test_type", nargs="?", default="all")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--har-mode", choices=["live", "record", "replay"])
+    parser.add_argument("--base-url")
+    parser.add_argument("--standin", action="store_true")
+    parser.add_argument("--route-profile", choices=list(route_profiles.ROUTE_PROFILES))
+    parser.add_argument("--profile", choices=list(run_profiles.RUN_PROFILES))
+    parser.add_argument("--screenshot-policy", choices=SCREENSHOT_POLICIES)
+    parser.add_argument("--screenshot-sample-rate", type=int)
+    parser.add_argument("--quarantine", action="store_true")
+    parser.add_argument("--failed-first", action="store_true")
+    parser.add_argument("--only-failed", action="store_true")
+    parser.add_argument("--fail-fast-after", type=int)
+    parser.add_argument("--single-file-report", action="store_true")
+    parser.add_argument("-h", "--help", action="store_true")
+    args = parser.parse_args()
     
-    if test_type in ["--help", "-h", "help"]:
+    if args.help or args.test_type == "help":
         print_test_options()
         sys.exit(0)
     
-    success = run_tests(test_type)
+    standin_process = None
+    base_url = args.base_url
+    if args.standin:
+        standin_process, base_url = start_standin_server()
+    
+    try:
+        success = run_tests(args.test_type, workers=args.workers, har_mode=args.har_mode,
+                            base_url=base_url, route_profile=args.route_profile,
+                            single_file_report=args.single_file_report,
+                            screenshot_policy=args.screenshot_policy,
+                            screenshot_sample_rate=args.screenshot_sample_rate,
+                            profile=args.profile, quarantine=args.quarantine,
+                            failed_first=args.failed_first, only_failed=args.only_failed,
+                            fail_fast_after=args.fail_fast_after)
+    finally:
+        if standin_process:
+            standin_process.terminate()
     sys.exit(0 if success else 1)
\ No newline at end of file
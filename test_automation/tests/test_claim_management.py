@@ -4,7 +4,7 @@
 import pytest
 from playwright.sync_api import Page, expect
 from pages.claim_management_page import ClaimManagementPage
-from utils.helpers import capture_screenshot
+from utils import screenshot_policy
 
 class TestClaimManagement:
 
@@ -24,7 +24,7 @@ class TestClaimManagement:
         # Verify page heading
         expect(claims_page.page_heading).to_be_visible()
         
-        capture_screenshot(page, "claims_navigation_success.png")
+        screenshot_policy.checkpoint(page, "claims_navigation_success.png")
 
     @pytest.mark.claims
     @pytest.mark.high
@@ -51,7 +51,7 @@ class TestClaimManagement:
         expect(claims_page.search_box).to_be_visible()
         expect(claims_page.search_button).to_be_visible()
         
-        capture_screenshot(page, "claims_page_elements.png")
+        screenshot_policy.checkpoint(page, "claims_page_elements.png")
 
     @pytest.mark.claims
     @pytest.mark.medium
@@ -80,7 +80,7 @@ class TestClaimManagement:
         # Verify pagination controls
         expect(claims_page.pagination_info).to_be_visible()
         
-        capture_screenshot(page, "claims_grid_display.png")
+        screenshot_policy.checkpoint(page, "claims_grid_display.png")
 
     @pytest.mark.claims
     @pytest.mark.high
@@ -98,7 +98,7 @@ class TestClaimManagement:
         search_value = claims_page.search_box.input_value()
         assert search_value == sample_claim["claim_id"]
         
-        capture_screenshot(page, "claims_search_success.png")
+        screenshot_policy.checkpoint(page, "claims_search_success.png")
 
     @pytest.mark.claims
     @pytest.mark.medium
@@ -115,7 +115,7 @@ class TestClaimManagement:
         # Click payer filter
         claims_page.payer_filter.click()
         
-        capture_screenshot(page, "claims_payer_filter.png")
+        screenshot_policy.checkpoint(page, "claims_payer_filter.png")
 
     @pytest.mark.claims
     @pytest.mark.medium
@@ -132,7 +132,7 @@ class TestClaimManagement:
         # Click status filter
         claims_page.status_filter.click()
         
-        capture_screenshot(page, "claims_status_filter.png")
+        screenshot_policy.checkpoint(page, "claims_status_filter.png")
 
     @pytest.mark.claims
     @pytest.mark.high
@@ -149,7 +149,7 @@ class TestClaimManagement:
         expect(claims_page.maa_option).to_be_visible()
         expect(claims_page.rghs_option).to_be_visible()
         
-        capture_screenshot(page, "claims_add_new_dropdown.png")
+        screenshot_policy.checkpoint(page, "claims_add_new_dropdown.png")
 
     @pytest.mark.claims
     @pytest.mark.high
@@ -167,7 +167,7 @@ class TestClaimManagement:
         expect(claims_page.submit_button).to_be_visible()
         expect(claims_page.cancel_button).to_be_visible()
         
-        capture_screenshot(page, "claims_maa_form.png")
+        screenshot_policy.checkpoint(page, "claims_maa_form.png")
 
 
     @pytest.mark.claims
@@ -191,7 +191,7 @@ class TestClaimManagement:
         selected_value = stage_dropdown.input_value()
         assert selected_value == "SETTLEMENT"  # The actual value is SETTLEMENT
         
-        capture_screenshot(page, "claims_stage_dropdown.png")
+        screenshot_policy.checkpoint(page, "claims_stage_dropdown.png")
 
     @pytest.mark.claims
     @pytest.mark.high
@@ -212,7 +212,7 @@ class TestClaimManagement:
         format_info = page.locator("text=/PDF.*JPG.*PNG/")
         expect(format_info).to_be_visible()
         
-        capture_screenshot(page, "claims_file_upload.png")
+        screenshot_policy.checkpoint(page, "claims_file_upload.png")
 
     @pytest.mark.claims
     @pytest.mark.medium
@@ -235,7 +235,7 @@ class TestClaimManagement:
         form_visible = claims_page.form_heading.is_visible()
         assert not form_visible or True  # Form may close or not
         
-        capture_screenshot(page, "claims_form_cancel.png")
+        screenshot_policy.checkpoint(page, "claims_form_cancel.png")
 
     @pytest.mark.claims
     @pytest.mark.medium
@@ -253,7 +253,7 @@ class TestClaimManagement:
         if entries_dropdown.is_visible():
             expect(entries_dropdown).to_be_visible()
         
-        capture_screenshot(page, "claims_pagination.png")
+        screenshot_policy.checkpoint(page, "claims_pagination.png")
 
     @pytest.mark.claims
     @pytest.mark.high
@@ -273,4 +273,4 @@ class TestClaimManagement:
             # If no data, at least grid structure should exist
             expect(claims_page.claims_grid).to_be_visible()
         
-        capture_screenshot(page, "claims_grid_data.png")
\ No newline at end of file
+        screenshot_policy.checkpoint(page, "claims_grid_data.png")
\ No newline at end of file
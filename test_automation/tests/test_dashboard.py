@@ -3,7 +3,7 @@
 import pytest
 from playwright.sync_api import Page, expect, TimeoutError
 from pages.dashboard_page import DashboardPage
-from utils.helpers import capture_screenshot
+from utils import screenshot_policy
 
 class TestDashboard:
 
@@ -22,7 +22,7 @@ class TestDashboard:
         # Verify welcome message - more flexible check
         expect(dashboard_page.welcome_message).to_be_visible()
         
-        capture_screenshot(authenticated_session, "dashboard_navigation_success.png")
+        screenshot_policy.checkpoint(authenticated_session, "dashboard_navigation_success.png")
 
     @pytest.mark.dashboard
     @pytest.mark.medium
@@ -36,7 +36,7 @@ class TestDashboard:
         # Verify welcome message exists
         expect(dashboard_page.welcome_message).to_be_visible()
         
-        capture_screenshot(authenticated_session, "dashboard_user_info.png")
+        screenshot_policy.checkpoint(authenticated_session, "dashboard_user_info.png")
 
     @pytest.mark.dashboard
     @pytest.mark.high
@@ -60,7 +60,7 @@ class TestDashboard:
             expect(alt_logout_button).to_be_visible()
             expect(alt_logout_button).to_be_enabled()
         
-        capture_screenshot(authenticated_session, "dashboard_navigation_menu.png")
+        screenshot_policy.checkpoint(authenticated_session, "dashboard_navigation_menu.png")
 
 
     @pytest.mark.dashboard
@@ -135,7 +135,7 @@ class TestDashboard:
         
         # If all approaches fail, capture screenshot for debugging
         if not logout_success:
-            capture_screenshot(authenticated_session, "logout_failure_debug.png")
+            screenshot_policy.checkpoint(authenticated_session, "logout_failure_debug.png")
             pytest.fail("Unable to locate or click logout button using any method")
         
         # Wait for navigation with extended timeout
@@ -170,8 +170,8 @@ class TestDashboard:
                 continue
         
         if not login_form_found:
-            capture_screenshot(authenticated_session, "login_page_debug.png")
+            screenshot_policy.checkpoint(authenticated_session, "login_page_debug.png")
             # Don't fail the test, just warn
             print("Warning: Could not verify login form visibility, but logout navigation succeeded")
         
-        capture_screenshot(authenticated_session, "dashboard_logout_success.png")
\ No newline at end of file
+        screenshot_policy.checkpoint(authenticated_session, "dashboard_logout_success.png")
\ No newline at end of file
@@ -3,7 +3,8 @@
 import pytest
 from playwright.sync_api import Page, expect
 from pages.login_page import LoginPage
-from utils.helpers import capture_screenshot
+from utils import screenshot_policy
+from utils import waits
 
 class TestLogin:
     
@@ -11,15 +12,15 @@ class TestLogin:
     def test_valid_login_credentials(self, login_page_setup: Page, test_data):
         """Test login with valid credentials"""
         login_page = LoginPage(login_page_setup)
-        login_page.wait_for_page_load()
         
         credentials = test_data["positive_credentials"]
         login_page.login(credentials["email"], credentials["password"])
         
         # Wait for navigation and verify login success
-        login_page_setup.wait_for_timeout(3000)
+        waits.until_url(login_page_setup, "**/hospital-owner-dashboard", "login_redirect",
+                        timeout=10000, replaces_ms=3000)
         assert login_page.is_login_successful(), "Login should be successful"
-        capture_screenshot(login_page_setup, "valid_login_success.png")
+        screenshot_policy.checkpoint(login_page_setup, "valid_login_success.png")
     
     @pytest.mark.positive
     def test_email_field_accepts_valid_email(self, login_page_setup: Page, test_data):
@@ -98,11 +99,11 @@ class TestLogin:
         test_case = test_data["negative_test_cases"][0]
         
         login_page.login(test_case["email"], test_case["password"])
-        login_page_setup.wait_for_timeout(2000)
+        login_page.wait_for_login_outcome()
         
         # Check if login failed (still on login page)
         assert not login_page.is_login_successful(), "Login should fail with invalid email"
-        capture_screenshot(login_page_setup, "invalid_email_format.png")
+        screenshot_policy.checkpoint(login_page_setup, "invalid_email_format.png")
     
     @pytest.mark.negative
     def test_empty_email_field(self, login_page_setup: Page, test_data):
@@ -111,10 +112,10 @@ class TestLogin:
         test_case = test_data["negative_test_cases"][1]
         
         login_page.login(test_case["email"], test_case["password"])
-        login_page_setup.wait_for_timeout(2000)
+        login_page.wait_for_login_outcome()
         
         assert not login_page.is_login_successful(), "Login should fail with empty email"
-        capture_screenshot(login_page_setup, "empty_email_field.png")
+        screenshot_policy.checkpoint(login_page_setup, "empty_email_field.png")
     
     @pytest.mark.negative
     def test_empty_password_field(self, login_page_setup: Page, test_data):
@@ -123,10 +124,10 @@ class TestLogin:
         test_case = test_data["negative_test_cases"][2]
         
         login_page.login(test_case["email"], test_case["password"])
-        login_page_setup.wait_for_timeout(2000)
+        login_page.wait_for_login_outcome()
         
         assert not login_page.is_login_successful(), "Login should fail with empty password"
-        capture_screenshot(login_page_setup, "empty_password_field.png")
+        screenshot_policy.checkpoint(login_page_setup, "empty_password_field.png")
     
     @pytest.mark.negative
     def test_both_fields_empty(self, login_page_setup: Page, test_data):
@@ -135,10 +136,10 @@ class TestLogin:
         test_case = test_data["negative_test_cases"][3]
         
         login_page.login(test_case["email"], test_case["password"])
-        login_page_setup.wait_for_timeout(2000)
+        login_page.wait_for_login_outcome()
         
         assert not login_page.is_login_successful(), "Login should fail with both fields empty"
-        capture_screenshot(login_page_setup, "both_fields_empty.png")
+        screenshot_policy.checkpoint(login_page_setup, "both_fields_empty.png")
     
     @pytest.mark.negative
     def test_wrong_email_valid_password(self, login_page_setup: Page, test_data):
@@ -147,10 +148,10 @@ class TestLogin:
         test_case = test_data["negative_test_cases"][4]
         
         login_page.login(test_case["email"], test_case["password"])
-        login_page_setup.wait_for_timeout(2000)
+        login_page.wait_for_login_outcome()
         
         assert not login_page.is_login_successful(), "Login should fail with wrong email"
-        capture_screenshot(login_page_setup, "wrong_email.png")
+        screenshot_policy.checkpoint(login_page_setup, "wrong_email.png")
     
     @pytest.mark.negative
     def test_valid_email_wrong_password(self, login_page_setup: Page, test_data):
@@ -159,10 +160,10 @@ class TestLogin:
         test_case = test_data["negative_test_cases"][5]
         
         login_page.login(test_case["email"], test_case["password"])
-        login_page_setup.wait_for_timeout(2000)
+        login_page.wait_for_login_outcome()
         
         assert not login_page.is_login_successful(), "Login should fail with wrong password"
-        capture_screenshot(login_page_setup, "wrong_password.png")
+        screenshot_policy.checkpoint(login_page_setup, "wrong_password.png")
     
     @pytest.mark.negative
     def test_sql_injection_attempt(self, login_page_setup: Page, test_data):
@@ -171,10 +172,10 @@ class TestLogin:
         test_case = test_data["negative_test_cases"][6]
         
         login_page.login(test_case["email"], test_case["password"])
-        login_page_setup.wait_for_timeout(2000)
+        login_page.wait_for_login_outcome()
         
         assert not login_page.is_login_successful(), "Login should fail with SQL injection attempt"
-        capture_screenshot(login_page_setup, "sql_injection_attempt.png")
+        screenshot_policy.checkpoint(login_page_setup, "sql_injection_attempt.png")
     
     @pytest.mark.negative
     def test_xss_attempt(self, login_page_setup: Page, test_data):
@@ -183,10 +184,10 @@ class TestLogin:
         test_case = test_data["negative_test_cases"][7]
         
         login_page.login(test_case["email"], test_case["password"])
-        login_page_setup.wait_for_timeout(2000)
+        login_page.wait_for_login_outcome()
         
         assert not login_page.is_login_successful(), "Login should fail with XSS attempt"
-        capture_screenshot(login_page_setup, "xss_attempt.png")
+        screenshot_policy.checkpoint(login_page_setup, "xss_attempt.png")
     
     @pytest.mark.negative
     def test_very_long_email(self, login_page_setup: Page, test_data):
@@ -195,10 +196,10 @@ class TestLogin:
         test_case = test_data["negative_test_cases"][8]
         
         login_page.login(test_case["email"], test_case["password"])
-        login_page_setup.wait_for_timeout(2000)
+        login_page.wait_for_login_outcome()
         
         assert not login_page.is_login_successful(), "Login should fail with very long email"
-        capture_screenshot(login_page_setup, "very_long_email.png")
+        screenshot_policy.checkpoint(login_page_setup, "very_long_email.png")
     
     @pytest.mark.negative
     def test_very_long_password(self, login_page_setup: Page, test_data):
@@ -207,10 +208,10 @@ class TestLogin:
         test_case = test_data["negative_test_cases"][9]
         
         login_page.login(test_case["email"], test_case["password"])
-        login_page_setup.wait_for_timeout(2000)
+        login_page.wait_for_login_outcome()
         
         assert not login_page.is_login_successful(), "Login should fail with very long password"
-        capture_screenshot(login_page_setup, "very_long_password.png")
+        screenshot_policy.checkpoint(login_page_setup, "very_long_password.png")
 
 
 # How to run tests:
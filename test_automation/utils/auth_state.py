@@ -0,0 +1,101 @@
+import os
+import json
+import time
+from playwright.sync_api import BrowserContext
+from config.config import Config
+from utils.helpers import get_worker_id
+
+def get_state_path(worker_id: str = None):
+    """Get path of the cached storage state file for a worker"""
+    if worker_id is None:
+        worker_id = get_worker_id()
+    return os.path.join(Config.AUTH_STATE_DIR, f"storage_state_{worker_id}.json")
+
+def is_state_fresh(cached_state: dict):
+    """Check the cached state has not passed its expiry or any cookie expiry"""
+    now = time.time()
+    if cached_state.get("expires_at", 0) <= now:
+        return False
+
+    for cookie in cached_state.get("storage_state", {}).get("cookies", []):
+        # Session cookies report expires == -1
+        expires = cookie.get("expires", -1)
+        if expires > 0 and expires <= now:
+            return False
+
+    return True
+
+def load_cached_state(state_path: str = None):
+    """Load cached storage state if present and not stale, otherwise None"""
+    state_path = state_path or get_state_path()
+    if not os.path.exists(state_path):
+        return None
+
+    try:
+        with open(state_path, 'r') as f:
+            cached_state = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Ignoring unreadable auth state {state_path}: {e}")
+        return None
+
+    if not is_state_fresh(cached_state):
+        return None
+
+    return cached_state["storage_state"]
+
+def save_state(context: BrowserContext, state_path: str = None, ttl: int = None):
+    """Save cookies and localStorage of a logged-in context with an expiry"""
+    state_path = state_path or get_state_path()
+    ttl = Config.AUTH_STATE_TTL if ttl is None else ttl
+    os.makedirs(os.path.dirname(state_path), exist_ok=True)
+
+    saved_at = time.time()
+    cached_state = {
+        "saved_at": saved_at,
+        "expires_at": saved_at + ttl,
+        "storage_state": context.storage_state()
+    }
+
+    # Write to a temp file first so a concurrent reader never sees half a file
+    tmp_path = f"{state_path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(cached_state, f)
+    os.replace(tmp_path, state_path)
+    return state_path
+
+def invalidate_state(state_path: str = None):
+    """Remove the cached storage state so the next test logs in again"""
+    state_path = state_path or get_state_path()
+    try:
+        os.remove(state_path)
+    except FileNotFoundError:
+        pass
+
+def apply_state(context: BrowserContext, storage_state: dict):
+    """Load saved cookies and localStorage into an already created context"""
+    if storage_state.get("cookies"):
+        context.add_cookies(storage_state["cookies"])
+
+    origins = {
+        entry["origin"]: {item["name"]: item["value"] for item in entry.get("localStorage", [])}
+        for entry in storage_state.get("origins", [])
+    }
+    if not origins:
+        return
+
+    # localStorage can only be written from a page of the same origin, so seed it
+    # from an init script. The sessionStorage flag makes it run once per tab, so a
+    # test that logs out is not logged back in on its next navigation.
+    context.add_init_script(f"""
+        (() => {{
+            const origins = {json.dumps(origins)};
+            const items = origins[window.location.origin];
+            if (!items || window.sessionStorage.getItem('__auth_state_applied')) {{
+                return;
+            }}
+            for (const [name, value] of Object.entries(items)) {{
+                window.localStorage.setItem(name, value);
+            }}
+            window.sessionStorage.setItem('__auth_state_applied', '1');
+        }})();
+    """)
@@ -1,7 +1,17 @@
 import json
 import os
+import html
+import math
+import heapq
+import shutil
 from datetime import datetime
 from utils.helpers import screenshot_to_base64
+from utils.report_assets import store_screenshot_asset
+from utils import screenshot_pipeline
+from utils.trace_export import export_chrome_trace
+from utils.failure_clusters import cluster_failures
+from utils import run_history
+from config.config import Config
 
 # Check if plotly is available
 try:
@@ -13,10 +23,30 @@ except ImportError:
     print("Plotly not available - using CSS charts")
     PLOTLY_AVAILABLE = False
 
-def generate_comprehensive_report(test_results):
+# Rows in the slowest-tests table
+SLOWEST_TESTS_SHOWN = 10
+
+# Members listed per failure cluster; the representative failure is always shown in full
+MAX_CLUSTER_MEMBERS = 200
+
+# Earlier runs shown in the run history trend
+HISTORY_RUNS_SHOWN = 20
+
+# Rows in the flake leaderboard
+FLAKY_TESTS_SHOWN = 15
+
+# Longest per-test step timeline drawn in full; the rest is summarized
+MAX_TIMELINE_SPANS = 150
+
+# Where the streamed test logs go inside the report template
+PASSED_LOGS_MARKER = "<!-- passed-test-logs -->"
+FAILED_LOGS_MARKER = "<!-- failed-test-logs -->"
+
+def generate_comprehensive_report(test_results, asset_mode=None):
     """Generate comprehensive HTML report with all features"""
     
     print("Generating comprehensive test report...")
+    asset_mode = asset_mode or Config.REPORT_ASSET_MODE
     
     # Create reports directory
     os.makedirs("reports", exist_ok=True)
@@ -24,6 +54,20 @@ def generate_comprehensive_report(test_results):
     
     # Calculate statistics
     stats = calculate_test_statistics(test_results)
+    stats['screenshots'] = screenshot_pipeline.load_stats()
+    
+    # Store the run first so the trend sections include it
+    run_history.record_run(test_results)
+    stats['history'] = {
+        'runs': run_history.get_recent_runs(HISTORY_RUNS_SHOWN),
+        'changes': run_history.get_status_changes(),
+        'flaky': [score for score in run_history.get_flake_scores() if score['flips']][:FLAKY_TESTS_SHOWN]
+    }
+    
+    # Whole-run timeline, one row per worker, for ui.perfetto.dev or chrome://tracing
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    stats['timeline_file'] = f"timeline_{timestamp}.json"
+    export_chrome_trace(test_results, os.path.join("reports", stats['timeline_file']))
     
     # Generate charts (with fallback)
     if PLOTLY_AVAILABLE:
@@ -31,64 +75,161 @@ def generate_comprehensive_report(test_results):
     else:
         charts_html = generate_css_charts(stats)
     
-    # Generate detailed test logs
-    test_logs_html = generate_detailed_test_logs(test_results)
+    # Create comprehensive HTML report around markers for the test logs
+    html_template = create_comprehensive_html(stats, charts_html, PLOTLY_AVAILABLE)
     
-    # Create comprehensive HTML report
-    html_content = create_comprehensive_html(stats, charts_html, test_logs_html, PLOTLY_AVAILABLE)
-    
-    # Save the report
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    # Save the report, streaming test logs so memory stays flat however many tests ran
     report_path = os.path.join("reports", f"comprehensive_test_report_{timestamp}.html")
     
-    with open(report_path, 'w', encoding='utf-8') as f:
-        f.write(html_content)
+    # Written under a temporary name so the previous latest report is never seen half-written
+    partial_path = f"{report_path}.partial"
+    with open(partial_path, 'w', encoding='utf-8') as f:
+        write_comprehensive_html(f, html_template, test_results, asset_mode)
+    os.replace(partial_path, report_path)
     
     # Also create a latest report
     latest_report_path = os.path.join("reports", "latest_test_report.html")
-    with open(latest_report_path, 'w', encoding='utf-8') as f:
-        f.write(html_content)
+    publish_latest_report(report_path, latest_report_path)
+    
+    # Older runs stay queryable in the history database, so their HTML can go
+    pruned = run_history.prune_reports("reports")
+    if pruned:
+        print(f"Pruned {pruned} old report files (keeping the newest {Config.REPORT_RETENTION})")
     
     print(f"Comprehensive report generated: {report_path}")
     print(f"Latest report: {latest_report_path}")
     
     return latest_report_path
 
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = math.ceil(pct / 100 * len(sorted_values))
+    return sorted_values[max(rank, 1) - 1]
+
+def summarize_durations(durations):
+    """p50/p90/p99 and max of a list of durations in seconds"""
+    durations.sort()
+    return {
+        'p50': percentile(durations, 50),
+        'p90': percentile(durations, 90),
+        'p99': percentile(durations, 99),
+        'max': durations[-1] if durations else 0.0
+    }
+
 def calculate_test_statistics(test_results):
-    """Calculate comprehensive test statistics"""
+    """Calculate comprehensive test statistics in a single pass over the results"""
     total_tests = len(test_results)
-    passed_tests = len([t for t in test_results if t['status'] == 'PASSED'])
-    failed_tests = len([t for t in test_results if t['status'] == 'FAILED'])
+    passed_tests = 0
+    failed_tests = 0
+    total_duration = 0.0
+    durations = []
+    slowest = []
     
-    # Module-wise statistics
+    # Module, priority and file breakdowns share one shape
+    def new_group():
+        return {'total': 0, 'passed': 0, 'failed': 0, 'duration': 0.0}
     modules = {}
-    for test in test_results:
-        module = test['module']
-        if module not in modules:
-            modules[module] = {'total': 0, 'passed': 0, 'failed': 0}
-        modules[module]['total'] += 1
-        if test['status'] == 'PASSED':
-            modules[module]['passed'] += 1
-        else:
-            modules[module]['failed'] += 1
-    
-    # Priority-wise statistics
-    priorities = {'high': {'total': 0, 'passed': 0, 'failed': 0},
-                 'medium': {'total': 0, 'passed': 0, 'failed': 0},
-                 'low': {'total': 0, 'passed': 0, 'failed': 0}}
+    module_durations = {}
+    priorities = {'high': new_group(), 'medium': new_group(), 'low': new_group()}
+    files = {}
+    
+    # Event-driven waits, compared with the fixed sleeps they replaced
+    wait_count = 0
+    wait_ms = 0.0
+    sleep_saved_ms = 0.0
+    
+    # Requests and bytes the route profiles kept off the wire
+    blocked_requests = 0
+    blocked_bytes = 0
+    blocked_unknown_sizes = 0
+    
+    # Page readiness, compared with the networkidle wait it replaced
+    readiness = {}
+    
+    # Fixture overhead: pytest's setup and teardown phases against the test bodies,
+    # and each fixture's own setup and teardown time
+    phase_totals = {'setup': 0.0, 'call': 0.0, 'teardown': 0.0}
+    fixtures = {}
+    
+    # Traces kept for failed tests, indexed in the overview
+    traces = []
     
     for test in test_results:
-        for marker in test['markers']:
-            if marker in priorities:
-                priorities[marker]['total'] += 1
-                if test['status'] == 'PASSED':
-                    priorities[marker]['passed'] += 1
-                else:
-                    priorities[marker]['failed'] += 1
-    
-    # Calculate durations
-    total_duration = sum(float(test['duration'].replace('s', '')) for test in test_results)
+        status = test['status']
+        passed = status == 'PASSED'
+        duration = test['duration']
+        
+        if passed:
+            passed_tests += 1
+        elif status == 'FAILED':
+            failed_tests += 1
+        total_duration += duration
+        durations.append(duration)
+        
+        # Bounded heap of the slowest tests, so memory does not grow with the run
+        entry = (duration, test.get('test_id') or test['test_name'], test['module'])
+        if len(slowest) < SLOWEST_TESTS_SHOWN:
+            heapq.heappush(slowest, entry)
+        elif entry > slowest[0]:
+            heapq.heapreplace(slowest, entry)
+        
+        groups = [modules.setdefault(test['module'], new_group()),
+                  files.setdefault(test['test_file'], new_group())]
+        groups += [priorities[marker] for marker in test['markers'] if marker in priorities]
+        for group in groups:
+            group['total'] += 1
+            group['passed' if passed else 'failed'] += 1
+            group['duration'] += duration
+        module_durations.setdefault(test['module'], []).append(duration)
+        
+        for wait in test.get('waits', []):
+            wait_count += 1
+            wait_ms += wait['duration_ms']
+            if wait['replaces_ms']:
+                sleep_saved_ms += wait['replaces_ms'] - wait['duration_ms']
+        
+        network = test.get('network') or {}
+        blocked_requests += network.get('blocked_requests', 0)
+        blocked_bytes += network.get('blocked_bytes', 0)
+        blocked_unknown_sizes += network.get('unknown_sizes', 0)
+        
+        for record in test.get('readiness', []):
+            page_stats = readiness.setdefault(record['page'], {
+                'loads': 0, 'ready_ms': 0.0, 'compared_loads': 0,
+                'networkidle_ms': 0.0, 'saved_ms': 0.0, 'never_idle': 0
+            })
+            page_stats['loads'] += 1
+            page_stats['ready_ms'] += record['ready_ms']
+            if record['networkidle_ms'] is None:
+                page_stats['never_idle'] += 1
+            else:
+                page_stats['compared_loads'] += 1
+                page_stats['networkidle_ms'] += record['networkidle_ms']
+                page_stats['saved_ms'] += record['networkidle_ms'] - record['ready_ms']
+        
+        for phase, seconds in test.get('phases', {}).items():
+            phase_totals[phase] += seconds
+        for step in test.get('steps', []):
+            if step['kind'] not in ('fixture', 'fixture_teardown'):
+                continue
+            fixture_stats = fixtures.setdefault(step['name'], {'setups': 0, 'setup_ms': 0.0, 'teardown_ms': 0.0})
+            if step['kind'] == 'fixture':
+                fixture_stats['setups'] += 1
+                fixture_stats['setup_ms'] += step['duration_ms']
+            else:
+                fixture_stats['teardown_ms'] += step['duration_ms']
+        
+        if status == 'FAILED' and test.get('trace_path') and os.path.exists(test['trace_path']):
+            traces.append({'test_name': test['test_name'], 'link': get_report_link(test['trace_path'])})
+    
+    for module, module_stats in modules.items():
+        module_stats.update(summarize_durations(module_durations[module]))
+    
     avg_duration = total_duration / total_tests if total_tests > 0 else 0
+    phase_time = sum(phase_totals.values())
+    fixture_time = phase_totals['setup'] + phase_totals['teardown']
     
     return {
         'total': total_tests,
@@ -98,8 +239,22 @@ def calculate_test_statistics(test_results):
         'fail_rate': (failed_tests / total_tests * 100) if total_tests > 0 else 0,
         'total_duration': f"{total_duration:.2f}s",
         'avg_duration': f"{avg_duration:.2f}s",
+        'duration_percentiles': summarize_durations(durations),
+        'slowest_tests': sorted(slowest, reverse=True),
         'modules': modules,
         'priorities': priorities,
+        'files': files,
+        'wait_count': wait_count,
+        'wait_time': f"{wait_ms / 1000:.2f}s",
+        'sleep_time_saved': f"{sleep_saved_ms / 1000:.2f}s",
+        'readiness': readiness,
+        'blocked_requests': blocked_requests,
+        'blocked_bytes': f"{blocked_bytes / 1024:.0f} KB",
+        'blocked_unknown_sizes': blocked_unknown_sizes,
+        'traces': traces,
+        'phase_totals': phase_totals,
+        'fixture_overhead': (fixture_time / phase_time * 100) if phase_time > 0 else 0,
+        'fixtures': fixtures,
         'execution_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     }
 
@@ -211,93 +366,559 @@ def generate_css_charts(stats):
         'priority_chart': '<div><p style="text-align: center; color: #666;">CSS-based priority distribution</p></div>'
     }
 
-def generate_detailed_test_logs(test_results):
-    """Generate detailed test logs with screenshots and error messages"""
+def get_report_link(path):
+    """Link to an artifact relative to the reports directory the HTML is written to"""
+    return os.path.relpath(path, "reports").replace(os.sep, "/")
+
+def generate_trace_index(stats):
+    """Generate the index of Playwright traces kept for failed tests"""
+    if not stats['traces']:
+        return ''
     
-    passed_tests_html = ""
-    failed_tests_html = ""
+    rows_html = ''
+    for trace in stats['traces']:
+        rows_html += f"""
+            <tr>
+                <td>{trace['test_name']}</td>
+                <td><a href="{trace['link']}" download>{os.path.basename(trace['link'])}</a></td>
+            </tr>
+        """
     
-    for test in test_results:
-        # Clean test name for display
-        display_name = test['test_name'].replace('[chromium]', '').replace('_', ' ').title()
-        
-        test_html = f"""
-        <div class="test-log-item {'passed' if test['status'] == 'PASSED' else 'failed'}">
-            <div class="test-header">
-                <h4>
-                    <span class="status-badge {'passed' if test['status'] == 'PASSED' else 'failed'}">
-                        {test['status']}
-                    </span>
-                    {display_name}
-                </h4>
-                <div class="test-meta">
-                    <span class="badge">📁 {test['module']}</span>
-                    <span class="badge">⏱️ {test['duration']}</span>
-                    <span class="badge">📅 {test['start_time']}</span>
+    return f"""
+    <div class="chart-container">
+        <h3>🔍 Failure Traces</h3>
+        <p>Open with <code>playwright show-trace &lt;file&gt;</code> or drop the file on trace.playwright.dev</p>
+        <table class="readiness-table">
+            <tr>
+                <th>Test</th>
+                <th>Trace</th>
+            </tr>
+            {rows_html}
+        </table>
+    </div>
+    """
+
+def generate_latency_tables(stats):
+    """Generate the slowest-tests table and modules ranked by tail latency"""
+    if not stats['total']:
+        return ''
+    
+    slowest_rows = ''
+    for duration, test_id, module in stats['slowest_tests']:
+        slowest_rows += f"""
+            <tr>
+                <td>{test_id}</td>
+                <td>{module}</td>
+                <td>{duration:.2f}s</td>
+            </tr>
+        """
+    
+    module_rows = ''
+    for module, data in sorted(stats['modules'].items(), key=lambda item: item[1]['p99'], reverse=True):
+        module_rows += f"""
+            <tr>
+                <td>{module}</td>
+                <td>{data['total']}</td>
+                <td>{data['p50']:.2f}s</td>
+                <td>{data['p90']:.2f}s</td>
+                <td>{data['p99']:.2f}s</td>
+                <td>{data['max']:.2f}s</td>
+            </tr>
+        """
+    
+    percentiles = stats['duration_percentiles']
+    return f"""
+    <div class="chart-container">
+        <h3>🐢 Slowest Tests</h3>
+        <p>Suite durations: p50 {percentiles['p50']:.2f}s • p90 {percentiles['p90']:.2f}s • p99 {percentiles['p99']:.2f}s • max {percentiles['max']:.2f}s</p>
+        <table class="readiness-table">
+            <tr>
+                <th>Test</th>
+                <th>Module</th>
+                <th>Duration</th>
+            </tr>
+            {slowest_rows}
+        </table>
+    </div>
+    
+    <div class="chart-container">
+        <h3>📉 Modules by Tail Latency</h3>
+        <table class="readiness-table">
+            <tr>
+                <th>Module</th>
+                <th>Tests</th>
+                <th>p50</th>
+                <th>p90</th>
+                <th>p99</th>
+                <th>Max</th>
+            </tr>
+            {module_rows}
+        </table>
+    </div>
+    """
+
+def generate_history_trends(stats):
+    """Generate pass rate and duration across recent runs, plus what changed since the last one"""
+    runs = stats['history']['runs']
+    if len(runs) < 2:
+        return ''
+    
+    rows_html = ''
+    for run in runs:
+        pass_rate = run['passed'] / run['total'] * 100 if run['total'] else 0
+        rows_html += f"""
+            <tr>
+                <td>#{run['run_id']}</td>
+                <td>{run['recorded_at'].replace('T', ' ')}</td>
+                <td>{run['profile'] or '-'}</td>
+                <td>{run['total']}</td>
+                <td>{run['failed']}</td>
+                <td>
+                    <div class="trend-bar"><div class="trend-bar-fill" style="width: {pass_rate:.1f}%"></div></div>
+                    {pass_rate:.1f}%
+                </td>
+                <td>{run['duration']:.2f}s</td>
+                <td>{run['duration'] / run['total'] if run['total'] else 0:.2f}s</td>
+            </tr>
+        """
+    
+    changes = stats['history']['changes']
+    changes_html = ''
+    for title, test_ids in (("🔴 Newly failing", changes['new_failures']), ("🟢 Fixed", changes['fixed'])):
+        if test_ids:
+            items = ''.join(f"<li>{html.escape(test_id)}</li>" for test_id in test_ids)
+            changes_html += f"<h4>{title} since run #{runs[1]['run_id']} ({len(test_ids)})</h4><ul>{items}</ul>"
+    
+    return f"""
+    <div class="chart-container">
+        <h3>📈 Run History</h3>
+        <table class="readiness-table">
+            <tr>
+                <th>Run</th>
+                <th>Recorded</th>
+                <th>Profile</th>
+                <th>Tests</th>
+                <th>Failed</th>
+                <th>Pass Rate</th>
+                <th>Total Duration</th>
+                <th>Avg per Test</th>
+            </tr>
+            {rows_html}
+        </table>
+        {changes_html}
+    </div>
+    """
+
+def generate_flake_leaderboard(stats):
+    """Generate the flakiest tests of recent runs, marking the ones --quarantine sets aside"""
+    flaky = stats['history']['flaky']
+    if not flaky:
+        return ''
+    
+    rows_html = ''
+    for score in flaky:
+        rows_html += f"""
+            <tr>
+                <td>{html.escape(score['test_id'])}</td>
+                <td>{score['runs']}</td>
+                <td>{score['failures']}</td>
+                <td>{score['flips']}</td>
+                <td>{score['score']:.2f}</td>
+                <td>{'🚧 Quarantined' if score['quarantined'] else '-'}</td>
+            </tr>
+        """
+    
+    return f"""
+    <div class="chart-container">
+        <h3>🎲 Flake Leaderboard</h3>
+        <p>Score = pass/fail flips ÷ (runs − 1 + quarantine retries) over the last {Config.FLAKE_WINDOW} runs, a retry that passed counting as a flip; at {Config.FLAKE_THRESHOLD:.2f} or above
+        a test runs in the retried quarantine lane of <code>test_runner.py --quarantine</code></p>
+        <table class="readiness-table">
+            <tr>
+                <th>Test</th>
+                <th>Runs</th>
+                <th>Failures</th>
+                <th>Flips</th>
+                <th>Flake Score</th>
+                <th>Lane</th>
+            </tr>
+            {rows_html}
+        </table>
+    </div>
+    """
+
+def generate_fixture_table(stats):
+    """Generate per-fixture setup and teardown cost table under the setup/call/teardown split"""
+    if not stats['fixtures']:
+        return ''
+    
+    phase_totals = stats['phase_totals']
+    rows_html = ''
+    for fixture_name, data in sorted(stats['fixtures'].items(),
+                                     key=lambda item: item[1]['setup_ms'] + item[1]['teardown_ms'], reverse=True):
+        share = data['setup_ms'] / 1000 / phase_totals['setup'] * 100 if phase_totals['setup'] > 0 else 0
+        teardown_share = data['teardown_ms'] / 1000 / phase_totals['teardown'] * 100 if phase_totals['teardown'] > 0 else 0
+        rows_html += f"""
+            <tr>
+                <td>{fixture_name}</td>
+                <td>{data['setups']}</td>
+                <td>{data['setup_ms'] / data['setups'] if data['setups'] else 0:.0f} ms</td>
+                <td>{data['setup_ms'] / 1000:.2f}s</td>
+                <td>{share:.1f}%</td>
+                <td>{data['teardown_ms'] / 1000:.2f}s</td>
+                <td>{teardown_share:.1f}%</td>
+            </tr>
+        """
+    
+    return f"""
+    <div class="chart-container">
+        <h3>🧩 Fixture Overhead</h3>
+        <p>Setup {phase_totals['setup']:.2f}s • Test bodies {phase_totals['call']:.2f}s • Teardown {phase_totals['teardown']:.2f}s
+        — {stats['fixture_overhead']:.1f}% of suite time is fixture setup and teardown</p>
+        <table class="readiness-table">
+            <tr>
+                <th>Fixture</th>
+                <th>Setups</th>
+                <th>Avg Setup</th>
+                <th>Total Setup</th>
+                <th>Share of Setup Phase</th>
+                <th>Total Teardown</th>
+                <th>Share of Teardown Phase</th>
+            </tr>
+            {rows_html}
+        </table>
+    </div>
+    """
+
+def generate_readiness_table(stats):
+    """Generate per-page readiness table showing time saved against networkidle"""
+    if not stats['readiness']:
+        return ''
+    
+    rows_html = ''
+    for page_name, data in sorted(stats['readiness'].items()):
+        compared = data['compared_loads']
+        avg_ready = data['ready_ms'] / data['loads']
+        avg_idle = f"{data['networkidle_ms'] / compared:.0f} ms" if compared else 'n/a'
+        avg_saved = f"{data['saved_ms'] / compared:.0f} ms" if compared else 'n/a'
+        rows_html += f"""
+            <tr>
+                <td>{page_name}</td>
+                <td>{data['loads']}</td>
+                <td>{avg_ready:.0f} ms</td>
+                <td>{avg_idle}</td>
+                <td>{avg_saved}</td>
+                <td>{data['saved_ms'] / 1000:.2f}s</td>
+                <td>{data['never_idle']}</td>
+            </tr>
+        """
+    
+    return f"""
+    <div class="chart-container">
+        <h3>⚡ Page Readiness vs Network Idle</h3>
+        <table class="readiness-table">
+            <tr>
+                <th>Page</th>
+                <th>Loads</th>
+                <th>Avg Ready</th>
+                <th>Avg Network Idle (est.)</th>
+                <th>Avg Saved</th>
+                <th>Total Saved</th>
+                <th>Never Idle</th>
+            </tr>
+            {rows_html}
+        </table>
+    </div>
+    """
+
+def format_network_summary(network):
+    """Describe what a test's route profile blocked"""
+    if not network:
+        return 'N/A'
+    summary = f"{network['profile']} profile - {network['blocked_requests']} requests blocked, {network['blocked_bytes'] / 1024:.0f} KB saved"
+    if network['unknown_sizes']:
+        summary += (f" ({network['unknown_sizes']} of unknown size, not counted - run once with "
+                    f"--route-profile=full or --har-mode=record to learn them)")
+    return summary
+
+def generate_screenshot_html(screenshot_path, asset_mode):
+    """Generate the screenshot section: a lazy thumbnail linked to the stored asset, or inline base64"""
+    if asset_mode == "single-file":
+        screenshot_src = screenshot_to_base64(screenshot_path)
+        full_src = screenshot_src
+    else:
+        asset = store_screenshot_asset(screenshot_path)
+        screenshot_src = asset['thumbnail'] if asset else None
+        full_src = asset['full'] if asset else None
+    
+    if not screenshot_src:
+        return f"""
+                <div class="screenshot-section">
+                    <h5>📸 Screenshot:</h5>
+                    <p>Screenshot available at: {screenshot_path}</p>
                 </div>
-            </div>
-            
-            <div class="test-details">
-                <div class="test-info">
-                    <p><strong>Test File:</strong> {test['test_file']}</p>
-                    <p><strong>Test ID:</strong> {test.get('test_id', 'N/A')}</p>
-                    <p><strong>Duration:</strong> {test['duration']}</p>
-                    <p><strong>Markers:</strong> {', '.join(test['markers']) if test['markers'] else 'None'}</p>
+                """
+    
+    # The full image is only fetched when the thumbnail is clicked
+    full_attr = '' if full_src == screenshot_src else f' data-full="{full_src}"'
+    return f"""
+                <div class="screenshot-section">
+                    <h5>📸 Failure Screenshot:</h5>
+                    <div class="screenshot-container">
+                        <img src="{screenshot_src}"{full_attr} loading="lazy" alt="Test failure screenshot" class="failure-screenshot" onclick="openModal(this)">
+                        <p class="screenshot-caption">Click to enlarge • {os.path.basename(screenshot_path)}</p>
+                    </div>
                 </div>
+                """
+
+def format_phases(phases):
+    """One-line setup/call/teardown split for a test"""
+    if not phases:
+        return 'Not recorded'
+    return f"setup {phases['setup']:.2f}s • call {phases['call']:.2f}s • teardown {phases['teardown']:.2f}s"
+
+def generate_step_timeline(steps):
+    """Generate a per-test timeline of page-object steps and Playwright actions"""
+    if not steps:
+        return ''
+    
+    timeline_start = min(step['start_ms'] for step in steps)
+    timeline_end = max(step['start_ms'] + step['duration_ms'] for step in steps)
+    timeline_ms = max(timeline_end - timeline_start, 1)
+    
+    rows_html = ''
+    for step in steps[:MAX_TIMELINE_SPANS]:
+        left = (step['start_ms'] - timeline_start) / timeline_ms * 100
+        width = max(step['duration_ms'] / timeline_ms * 100, 0.2)
+        error = f" ⚠️ {step['error']}" if step['error'] else ''
+        rows_html += f"""
+                    <div class="timeline-row">
+                        <span class="timeline-label" style="padding-left: {step['depth'] * 14}px" title="{step['name']}">{step['name']}{error}</span>
+                        <span class="timeline-track"><span class="timeline-bar {step['kind']}" style="left: {left:.2f}%; width: {width:.2f}%"></span></span>
+                        <span class="timeline-duration">{step['duration_ms']:.0f} ms</span>
+                    </div>"""
+    if len(steps) > MAX_TIMELINE_SPANS:
+        rows_html += f"""
+                    <p class="timeline-more">… {len(steps) - MAX_TIMELINE_SPANS} more spans not shown</p>"""
+    
+    return f"""
+            <details class="step-timeline">
+                <summary>⏱️ Step Timeline ({len(steps)} spans over {timeline_ms / 1000:.2f}s)</summary>
+                {rows_html}
+            </details>
+    """
+
+def generate_wait_baselines(waits):
+    """Generate a failed test's waits with the observed latency next to the learned baseline"""
+    if not waits:
+        return ''
+    
+    rows_html = ''
+    for wait in waits:
+        baseline = f"{wait['baseline_ms']:.0f} ms" if wait.get('baseline_ms') is not None else 'not learned yet'
+        ratio = f"{wait['duration_ms'] / wait['baseline_ms']:.1f}×" if wait.get('baseline_ms') else '-'
+        rows_html += f"""
+            <tr{' class="wait-timed-out"' if wait['timed_out'] else ''}>
+                <td>{wait['name']}</td>
+                <td>{wait['duration_ms']:.0f} ms{' (timed out)' if wait['timed_out'] else ''}</td>
+                <td>{baseline}</td>
+                <td>{ratio}</td>
+                <td>{wait['timeout_ms']} ms</td>
+            </tr>
         """
+    
+    return f"""
+            <div class="screenshot-section">
+                <h5>⏳ Waits vs Learned Baseline (p99):</h5>
+                <table class="readiness-table">
+                    <tr>
+                        <th>Wait</th>
+                        <th>Observed</th>
+                        <th>Baseline p99</th>
+                        <th>Observed / Baseline</th>
+                        <th>Timeout Used</th>
+                    </tr>
+                    {rows_html}
+                </table>
+            </div>
+    """
+
+def generate_test_log_item(test, asset_mode):
+    """Generate the detailed log of one test with its screenshot and error message"""
+    # Clean test name for display
+    display_name = test['test_name'].replace('[chromium]', '').replace('_', ' ').title()
+    
+    test_html = f"""
+    <div class="test-log-item {'passed' if test['status'] == 'PASSED' else 'failed'}">
+        <div class="test-header">
+            <h4>
+                <span class="status-badge {'passed' if test['status'] == 'PASSED' else 'failed'}">
+                    {test['status']}
+                </span>
+                {display_name}
+            </h4>
+            <div class="test-meta">
+                <span class="badge">📁 {test['module']}</span>
+                <span class="badge">⏱️ {test['duration']:.2f}s</span>
+                <span class="badge">📅 {test['start_time']}</span>
+                {f'<span class="badge">🚧 Quarantine lane, attempt {test["attempts"]}</span>' if test.get('quarantined') else ''}
+            </div>
+        </div>
         
-        if test['status'] == 'FAILED':
-            # Clean error message
-            error_msg = test['error_message'] if test['error_message'] else 'No error message available'
-            # Truncate very long error messages
-            if len(error_msg) > 2000:
-                error_msg = error_msg[:2000] + "... [truncated]"
-                
-            test_html += f"""
-                <div class="error-section">
-                    <h5>❌ Error Details:</h5>
-                    <div class="error-message">
-                        <pre>{error_msg}</pre>
-                    </div>
+        <div class="test-details">
+            <div class="test-info">
+                <p><strong>Test File:</strong> {test['test_file']}</p>
+                <p><strong>Test ID:</strong> {test.get('test_id', 'N/A')}</p>
+                <p><strong>Duration:</strong> {test['duration']:.2f}s</p>
+                <p><strong>Phases:</strong> {format_phases(test.get('phases'))}</p>
+                <p><strong>Markers:</strong> {', '.join(test['markers']) if test['markers'] else 'None'}</p>
+                <p><strong>Network:</strong> {format_network_summary(test.get('network'))}</p>
+                <p><strong>Waits:</strong> {len(test.get('waits', []))} ({sum(w['duration_ms'] for w in test.get('waits', [])) / 1000:.2f}s)</p>
+            </div>
+            {generate_step_timeline(test.get('steps'))}
+    """
+    
+    if test['status'] == 'FAILED':
+        # Clean error message
+        error_msg = test['error_message'] if test['error_message'] else 'No error message available'
+        # Truncate very long error messages
+        if len(error_msg) > 2000:
+            error_msg = error_msg[:2000] + "... [truncated]"
+            
+        test_html += f"""
+            <div class="error-section">
+                <h5>❌ Error Details:</h5>
+                <div class="error-message">
+                    <pre>{error_msg}</pre>
                 </div>
-            """
-            
-            if test['screenshot_path'] and os.path.exists(test['screenshot_path']):
-                screenshot_base64 = screenshot_to_base64(test['screenshot_path'])
-                if screenshot_base64:
-                    test_html += f"""
-                    <div class="screenshot-section">
-                        <h5>📸 Failure Screenshot:</h5>
-                        <div class="screenshot-container">
-                            <img src="{screenshot_base64}" alt="Test failure screenshot" class="failure-screenshot" onclick="openModal(this)">
-                            <p class="screenshot-caption">Click to enlarge • {os.path.basename(test['screenshot_path'])}</p>
-                        </div>
-                    </div>
-                    """
-                else:
-                    test_html += f"""
-                    <div class="screenshot-section">
-                        <h5>📸 Screenshot:</h5>
-                        <p>Screenshot available at: {test['screenshot_path']}</p>
-                    </div>
-                    """
-        
-        test_html += """
             </div>
-        </div>
         """
+        test_html += generate_wait_baselines(test.get('waits'))
         
-        if test['status'] == 'PASSED':
-            passed_tests_html += test_html
-        else:
-            failed_tests_html += test_html
+        if test['screenshot_path'] and os.path.exists(test['screenshot_path']):
+            test_html += generate_screenshot_html(test['screenshot_path'], asset_mode)
+        
+        if test.get('trace_path') and os.path.exists(test['trace_path']):
+            test_html += f"""
+                <div class="screenshot-section">
+                    <h5>🔍 Playwright Trace:</h5>
+                    <p><a href="{get_report_link(test['trace_path'])}" download>{os.path.basename(test['trace_path'])}</a>
+                    • DOM snapshots, network and console for every step; open with <code>playwright show-trace</code></p>
+                </div>
+                """
     
-    return {
-        'passed_tests': passed_tests_html,
-        'failed_tests': failed_tests_html
-    }
+    test_html += """
+        </div>
+    </div>
+    """
+    
+    return test_html
+
+def write_test_logs(report_file, test_results, passed, asset_mode):
+    """Stream the passed or failed test logs to the report one test at a time"""
+    written = 0
+    for test in test_results:
+        if (test['status'] == 'PASSED') == passed:
+            report_file.write(generate_test_log_item(test, asset_mode))
+            written += 1
+    
+    if not written:
+        report_file.write(f'<p style="text-align: center; color: #666; font-style: italic;">No {"passed" if passed else "failed"} tests to display.</p>')
+    return written
+
+def pick_representative(tests):
+    """The failure shown in full for a cluster: the first one with a screenshot on disk"""
+    for test in tests:
+        if test['screenshot_path'] and os.path.exists(test['screenshot_path']):
+            return test
+    return tests[0]
+
+def generate_cluster_members(tests):
+    """Generate the expandable member list of a failure cluster"""
+    rows_html = ''
+    for test in tests[:MAX_CLUSTER_MEMBERS]:
+        trace_link = ''
+        if test.get('trace_path') and os.path.exists(test['trace_path']):
+            trace_link = f'<a href="{get_report_link(test["trace_path"])}" download>trace</a>'
+        rows_html += f"""
+                <tr>
+                    <td>{test.get('test_id') or test['test_name']}</td>
+                    <td>{test['module']}</td>
+                    <td>{test['duration']:.2f}s</td>
+                    <td>{test['start_time']}</td>
+                    <td>{trace_link}</td>
+                </tr>"""
+    if len(tests) > MAX_CLUSTER_MEMBERS:
+        rows_html += f"""
+                <tr><td colspan="5">… {len(tests) - MAX_CLUSTER_MEMBERS} more</td></tr>"""
+    
+    return f"""
+        <details class="cluster-members">
+            <summary>All {len(tests)} failing tests in this cluster</summary>
+            <table class="readiness-table">
+                <tr>
+                    <th>Test</th>
+                    <th>Module</th>
+                    <th>Duration</th>
+                    <th>Started</th>
+                    <th>Trace</th>
+                </tr>
+                {rows_html}
+            </table>
+        </details>
+    """
+
+def write_failure_clusters(report_file, test_results, asset_mode):
+    """Stream failed tests grouped by error fingerprint, one full example per cluster"""
+    clusters = cluster_failures(test_results)
+    if not clusters:
+        report_file.write('<p style="text-align: center; color: #666; font-style: italic;">No failed tests to display.</p>')
+        return 0
+    
+    for cluster in clusters:
+        tests = cluster['tests']
+        report_file.write(f"""
+    <div class="failure-cluster">
+        <div class="cluster-header">
+            <span class="cluster-count">{len(tests)}×</span>
+            <code>{html.escape(cluster['signature'])}</code>
+        </div>
+        """)
+        report_file.write(generate_test_log_item(pick_representative(tests), asset_mode))
+        report_file.write(generate_cluster_members(tests))
+        report_file.write("""
+    </div>
+        """)
+    return len(clusters)
+
+def write_comprehensive_html(report_file, html_template, test_results, asset_mode):
+    """Write the report template, streaming the test logs in at their markers"""
+    before_passed, rest = html_template.split(PASSED_LOGS_MARKER)
+    before_failed, after_failed = rest.split(FAILED_LOGS_MARKER)
+    
+    report_file.write(before_passed)
+    write_test_logs(report_file, test_results, True, asset_mode)
+    report_file.write(before_failed)
+    write_failure_clusters(report_file, test_results, asset_mode)
+    report_file.write(after_failed)
 
-def create_comprehensive_html(stats, charts_html, test_logs_html, plotly_available):
+def publish_latest_report(report_path, latest_report_path):
+    """Point latest_test_report.html at the finished report without rendering it again"""
+    if os.path.exists(latest_report_path) and os.path.samefile(report_path, latest_report_path):
+        return
+    
+    tmp_path = f"{latest_report_path}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    
+    # A hardlink costs nothing; fall back to a copy where links are not supported
+    try:
+        os.link(report_path, tmp_path)
+    except OSError:
+        shutil.copyfile(report_path, tmp_path)
+    os.replace(tmp_path, latest_report_path)
+
+def create_comprehensive_html(stats, charts_html, plotly_available):
     """Create comprehensive HTML report"""
     
     plotly_js = '<script src="https://cdn.plot.ly/plotly-latest.min.js"></script>' if plotly_available else ''
@@ -727,6 +1348,143 @@ def create_comprehensive_html(stats, charts_html, test_logs_html, plotly_availab
                 color: #bbb;
             }}
             
+            .readiness-table {{
+                width: 100%;
+                border-collapse: collapse;
+                margin-top: 10px;
+            }}
+            
+            .readiness-table th, .readiness-table td {{
+                padding: 10px;
+                border-bottom: 1px solid #dee2e6;
+                text-align: left;
+            }}
+            
+            .readiness-table th {{
+                background: #f8f9fa;
+                color: #495057;
+            }}
+            
+            .trend-bar {{
+                display: inline-block;
+                width: 120px;
+                height: 10px;
+                background: #f8d7da;
+                border-radius: 5px;
+                overflow: hidden;
+                vertical-align: middle;
+                margin-right: 8px;
+            }}
+            
+            .trend-bar-fill {{
+                height: 100%;
+                background: #28a745;
+            }}
+            
+            .wait-timed-out td {{
+                background: #f8d7da;
+                font-weight: bold;
+            }}
+            
+            .failure-cluster {{
+                border: 2px solid #f5c6cb;
+                border-radius: 10px;
+                padding: 15px;
+                margin-bottom: 25px;
+            }}
+            
+            .cluster-header {{
+                display: flex;
+                align-items: center;
+                gap: 12px;
+                margin-bottom: 10px;
+            }}
+            
+            .cluster-count {{
+                background: #dc3545;
+                color: white;
+                border-radius: 15px;
+                padding: 4px 12px;
+                font-weight: bold;
+                flex-shrink: 0;
+            }}
+            
+            .cluster-members summary {{
+                cursor: pointer;
+                font-weight: bold;
+                margin: 10px 0;
+            }}
+            
+            .step-timeline {{
+                margin: 15px 0;
+                font-size: 0.85em;
+            }}
+            
+            .step-timeline summary {{
+                cursor: pointer;
+                font-weight: bold;
+                margin-bottom: 8px;
+            }}
+            
+            .timeline-row {{
+                display: flex;
+                align-items: center;
+                gap: 10px;
+                padding: 2px 0;
+            }}
+            
+            .timeline-label {{
+                width: 320px;
+                flex-shrink: 0;
+                overflow: hidden;
+                text-overflow: ellipsis;
+                white-space: nowrap;
+                font-family: monospace;
+            }}
+            
+            .timeline-track {{
+                position: relative;
+                flex-grow: 1;
+                height: 12px;
+                background: #f1f3f5;
+                border-radius: 3px;
+            }}
+            
+            .timeline-bar {{
+                position: absolute;
+                top: 0;
+                height: 100%;
+                border-radius: 3px;
+                background: #667eea;
+            }}
+            
+            .timeline-bar.action {{
+                background: #a0aec0;
+            }}
+            
+            .timeline-bar.fixture {{
+                background: #48bb78;
+            }}
+            
+            .timeline-bar.fixture_teardown {{
+                background: #9ae6b4;
+            }}
+            
+            .timeline-bar.wait {{
+                background: #ed8936;
+            }}
+            
+            .timeline-duration {{
+                width: 70px;
+                text-align: right;
+                flex-shrink: 0;
+            }}
+            
+            .timeline-more {{
+                color: #6c757d;
+                font-style: italic;
+            }}
+            
             .stats-highlight {{
                 background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
                 color: white;
@@ -796,6 +1554,7 @@ def create_comprehensive_html(stats, charts_html, test_logs_html, plotly_availab
                 <h1>🚀 Comprehensive Test Report</h1>
                 <p>Eyther Application Test Suite</p>
                 <p>Generated on: {stats['execution_time']}</p>
+                <p><a href="{stats['timeline_file']}" download style="color: white;">⏱️ Run timeline (trace-event JSON)</a> • open in ui.perfetto.dev or chrome://tracing</p>
             </div>
             
             <div class="nav-tabs">
@@ -837,12 +1596,48 @@ def create_comprehensive_html(stats, charts_html, test_logs_html, plotly_availab
                             <span class="stat-value">{stats['avg_duration']}</span>
                             <span class="stat-label">Avg Duration</span>
                         </div>
+                        <div class="stat-item">
+                            <span class="stat-value">{stats['duration_percentiles']['p90']:.2f}s</span>
+                            <span class="stat-label">p90 Duration</span>
+                        </div>
                         <div class="stat-item">
                             <span class="stat-value">{len(stats['modules'])}</span>
                             <span class="stat-label">Modules</span>
                         </div>
+                        <div class="stat-item">
+                            <span class="stat-value">{stats['fixture_overhead']:.1f}%</span>
+                            <span class="stat-label">Fixture Overhead</span>
+                        </div>
+                        <div class="stat-item">
+                            <span class="stat-value">{stats['wait_time']}</span>
+                            <span class="stat-label">Time in {stats['wait_count']} Waits</span>
+                        </div>
+                        <div class="stat-item">
+                            <span class="stat-value">{stats['sleep_time_saved']}</span>
+                            <span class="stat-label">Saved vs Fixed Sleeps</span>
+                        </div>
+                        <div class="stat-item">
+                            <span class="stat-value">{stats['blocked_bytes']}</span>
+                            <span class="stat-label">Saved by {stats['blocked_requests']} Blocked Requests{f" ({stats['blocked_unknown_sizes']} of unknown size)" if stats['blocked_unknown_sizes'] else ''}</span>
+                        </div>
+                        <div class="stat-item">
+                            <span class="stat-value">{screenshot_pipeline.get_time_saved_ms(stats['screenshots']) / 1000:.2f}s</span>
+                            <span class="stat-label">Taken off Tests by {stats['screenshots']['captured']} Background Screenshots</span>
+                        </div>
                     </div>
                 </div>
+                
+                {generate_history_trends(stats)}
+                
+                {generate_flake_leaderboard(stats)}
+                
+                {generate_latency_tables(stats)}
+                
+                {generate_fixture_table(stats)}
+                
+                {generate_readiness_table(stats)}
+                
+                {generate_trace_index(stats)}
             </div>
             
             <!-- Charts Tab -->
@@ -861,7 +1656,7 @@ def create_comprehensive_html(stats, charts_html, test_logs_html, plotly_availab
             <div id="passed" class="tab-content">
                 <h2>✅ Passed Tests ({stats['passed']} tests)</h2>
                 <div class="test-logs">
-                    {test_logs_html['passed_tests'] if test_logs_html['passed_tests'] else '<p style="text-align: center; color: #666; font-style: italic;">No passed tests to display.</p>'}
+                    {PASSED_LOGS_MARKER}
                 </div>
             </div>
             
@@ -869,7 +1664,7 @@ def create_comprehensive_html(stats, charts_html, test_logs_html, plotly_availab
             <div id="failed" class="tab-content">
                 <h2>❌ Failed Tests ({stats['failed']} tests)</h2>
                 <div class="test-logs">
-                    {test_logs_html['failed_tests'] if test_logs_html['failed_tests'] else '<p style="text-align: center; color: #666; font-style: italic;">No failed tests to display.</p>'}
+                    {FAILED_LOGS_MARKER}
                 </div>
             </div>
         </div>
@@ -896,7 +1691,7 @@ def create_comprehensive_html(stats, charts_html, test_logs_html, plotly_availab
                 const modal = document.getElementById('screenshotModal');
                 const modalImg = document.getElementById('modalImage');
                 modal.style.display = 'block';
-                modalImg.src = img.src;
+                modalImg.src = img.dataset.full || img.src;
             }}
             
             function closeModal() {{
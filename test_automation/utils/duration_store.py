@@ -0,0 +1,52 @@
+import os
+import json
+import time
+from config.config import Config
+from utils.helpers import get_worker_id
+
+def record_durations(test_results, worker_id: str = None):
+    """Save the durations of this session's tests to the worker's own durations file"""
+    if not test_results:
+        return None
+
+    worker_id = worker_id or get_worker_id()
+    os.makedirs(Config.DURATIONS_DIR, exist_ok=True)
+    durations_path = os.path.join(Config.DURATIONS_DIR, f"durations_{worker_id}.json")
+
+    durations = _read_json(durations_path)
+    recorded_at = time.time()
+    for test in test_results:
+        durations[test['test_id']] = {
+            "duration": float(str(test['duration']).rstrip('s')),
+            "recorded_at": recorded_at
+        }
+
+    # Each worker owns its file, so an atomic replace is enough to stay consistent
+    tmp_path = f"{durations_path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(durations, f)
+    os.replace(tmp_path, durations_path)
+    return durations_path
+
+def load_durations():
+    """Load the latest known duration of every test across all workers' files"""
+    latest = {}
+    if not os.path.isdir(Config.DURATIONS_DIR):
+        return {}
+
+    for filename in os.listdir(Config.DURATIONS_DIR):
+        if not filename.endswith(".json"):
+            continue
+        for test_id, entry in _read_json(os.path.join(Config.DURATIONS_DIR, filename)).items():
+            if test_id not in latest or entry["recorded_at"] > latest[test_id]["recorded_at"]:
+                latest[test_id] = entry
+
+    return {test_id: entry["duration"] for test_id, entry in latest.items()}
+
+def _read_json(path):
+    """Read a JSON file, treating a missing or corrupt file as empty"""
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
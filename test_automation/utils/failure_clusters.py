@@ -0,0 +1,93 @@
+import os
+import re
+import hashlib
+
+# Volatile parts of an error message, replaced so repeats of one failure fingerprint alike
+NORMALIZERS = [
+    (re.compile(r"https?://\S+"), "<url>"),
+    (re.compile(r"0x[0-9a-fA-F]+"), "<addr>"),
+    (re.compile(r"\b\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(\.\d+)?\b"), "<time>"),
+    (re.compile(r"\d+(\.\d+)?"), "<n>"),
+    (re.compile(r"\s+"), " ")
+]
+
+# "path/to/file.py:123: ..." location lines of a pytest traceback ("in function" with --tb=short)
+FRAME_PATTERN = re.compile(r"^([^\s:]+\.py):(\d+):(?: in (\w+))?", re.MULTILINE)
+
+# pytest prefixes the exception lines of a traceback with "E   "
+ERROR_LINE_PATTERN = re.compile(r"^E\s+(.+)$", re.MULTILINE)
+
+# Frames from installed packages (Playwright, pytest) say where, not why
+LIBRARY_PATH_PARTS = ("site-packages", "dist-packages", "_pytest", "playwright/_impl")
+
+MAX_SIGNATURE_LENGTH = 300
+
+def normalize(text: str):
+    """Strip numbers, URLs, addresses and timestamps from an error line"""
+    for pattern, replacement in NORMALIZERS:
+        text = pattern.sub(replacement, text)
+    return text.strip()[:MAX_SIGNATURE_LENGTH]
+
+def get_error_line(error_message: str):
+    """The exception line of a pytest longrepr, falling back to its first line"""
+    error_lines = ERROR_LINE_PATTERN.findall(error_message)
+    for line in error_lines:
+        # Prefer "SomeError: message" over the assertion rewrite lines around it
+        if re.match(r"[\w.]+(Error|Exception|Timeout)\b", line):
+            return line
+    if error_lines:
+        return error_lines[0]
+    return next((line for line in error_message.splitlines() if line.strip()), "")
+
+def get_origin_frame(error_message: str):
+    """The deepest traceback frame in this project's code, as file:function or file:line"""
+    origin = None
+    for path, line_number, function in FRAME_PATTERN.findall(error_message):
+        if any(part in path for part in LIBRARY_PATH_PARTS):
+            continue
+        origin = f"{os.path.basename(path)}:{function or line_number}"
+    return origin or ""
+
+def get_signature(error_message: str):
+    """Human-readable signature parsed from a longrepr, for results stored without one"""
+    if not error_message:
+        return "No error message"
+    signature = normalize(get_error_line(error_message))
+    origin = get_origin_frame(error_message)
+    return f"{signature} @ {origin}" if origin else signature
+
+def get_excinfo_signature(excinfo):
+    """Human-readable signature shared by every failure in a cluster, from the exception itself.
+
+    The origin is the deepest traceback entry in this project's code, named file:function,
+    so it survives any --tb style and edits that only move lines around.
+    """
+    lines = str(excinfo.value).strip().splitlines()
+    signature = normalize(f"{excinfo.typename}: {lines[0]}" if lines else excinfo.typename)
+    origin = None
+    for entry in excinfo.traceback:
+        path = str(entry.path).replace("\\", "/")
+        if any(part in path for part in LIBRARY_PATH_PARTS):
+            continue
+        origin = f"{os.path.basename(path)}:{entry.name}"
+    return f"{signature} @ {origin}" if origin else signature
+
+def fingerprint(signature: str):
+    """Short stable id of a failure signature"""
+    return hashlib.sha1(signature.encode("utf-8")).hexdigest()[:12]
+
+def cluster_failures(test_results):
+    """Group failed tests by fingerprint, largest cluster first"""
+    clusters = {}
+    for test in test_results:
+        if test['status'] != 'FAILED':
+            continue
+        signature = test.get('error_signature') or get_signature(test.get('error_message') or "")
+        key = test.get('error_fingerprint') or fingerprint(signature)
+        cluster = clusters.setdefault(key, {
+            'fingerprint': key,
+            'signature': signature,
+            'tests': []
+        })
+        cluster['tests'].append(test)
+    return sorted(clusters.values(), key=lambda cluster: len(cluster['tests']), reverse=True)
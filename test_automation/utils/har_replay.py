@@ -0,0 +1,166 @@
+import os
+import re
+import json
+import base64
+import shutil
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from playwright.sync_api import BrowserContext, Route
+from config.config import Config
+from utils.helpers import get_worker_id
+
+# Headers describing the on-the-wire encoding, which no longer applies to the decoded HAR body
+DROPPED_RESPONSE_HEADERS = ("content-encoding", "content-length", "transfer-encoding")
+
+def get_har_path(module_name: str):
+    """Get path of the HAR recorded for a test module"""
+    return os.path.join(Config.HAR_DIR, f"{module_name}.har")
+
+def get_recording_dir(module_name: str, worker_id: str = None):
+    """Get directory holding a module's per-test recordings until they are merged, or one worker's share of it"""
+    recording_dir = os.path.join(Config.HAR_DIR, f"{module_name}.parts")
+    return os.path.join(recording_dir, worker_id) if worker_id else recording_dir
+
+def start_recording(context: BrowserContext, module_name: str, test_name: str):
+    """Record every request of a test's context; Playwright writes the HAR when the context closes"""
+    # One directory per worker, so parallel workers never write or clean up each other's files
+    recording_dir = get_recording_dir(module_name, get_worker_id())
+    os.makedirs(recording_dir, exist_ok=True)
+    safe_name = re.sub(r"[^\w.-]", "_", test_name)
+    har_path = os.path.join(recording_dir, f"{safe_name}.har")
+    context.route_from_har(har_path, update=True, update_content="embed", update_mode="full")
+    return har_path
+
+def merge_recordings(module_name: str):
+    """Merge a module's per-test recordings from every worker into the single HAR used for replay"""
+    recording_dir = get_recording_dir(module_name)
+    if not os.path.isdir(recording_dir):
+        return None
+
+    recording_paths = sorted(
+        os.path.join(worker_dir, filename)
+        for worker_dir in (os.path.join(recording_dir, name) for name in os.listdir(recording_dir))
+        if os.path.isdir(worker_dir)
+        for filename in os.listdir(worker_dir) if filename.endswith(".har")
+    )
+
+    merged = None
+    for recording_path in recording_paths:
+        with open(recording_path, 'r', encoding='utf-8') as f:
+            har = json.load(f)
+        if merged is None:
+            merged = har
+        else:
+            merged["log"]["entries"].extend(har["log"]["entries"])
+            merged["log"].setdefault("pages", []).extend(har["log"].get("pages", []))
+
+    if merged is None:
+        return None
+
+    har_path = get_har_path(module_name)
+    tmp_path = f"{har_path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(merged, f)
+    os.replace(tmp_path, har_path)
+
+    shutil.rmtree(recording_dir)
+
+    print(f"HAR recorded: {har_path} ({len(merged['log']['entries'])} requests)")
+    return har_path
+
+def merge_all_recordings():
+    """Merge the recordings of every module; test_runner calls this once all workers have finished"""
+    if not os.path.isdir(Config.HAR_DIR):
+        return []
+    module_names = [
+        filename[:-len(".parts")] for filename in sorted(os.listdir(Config.HAR_DIR))
+        if filename.endswith(".parts")
+    ]
+    return [har_path for har_path in map(merge_recordings, module_names) if har_path]
+
+def normalize_url(url: str):
+    """Drop volatile query parameters and sort the rest so equivalent URLs match"""
+    parts = urlsplit(url)
+    query = sorted(
+        (name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if name not in Config.HAR_IGNORED_QUERY_PARAMS
+    )
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(query), ""))
+
+def normalize_body(body: str):
+    """Canonicalize JSON bodies (key order, volatile fields) so equivalent POSTs match"""
+    if not body:
+        return ""
+    try:
+        data = json.loads(body)
+    except ValueError:
+        return body
+    return json.dumps(_drop_ignored_fields(data), sort_keys=True, separators=(",", ":"))
+
+def _drop_ignored_fields(data):
+    """Recursively remove fields listed in Config.HAR_IGNORED_BODY_FIELDS"""
+    if isinstance(data, dict):
+        return {
+            key: _drop_ignored_fields(value) for key, value in data.items()
+            if key not in Config.HAR_IGNORED_BODY_FIELDS
+        }
+    if isinstance(data, list):
+        return [_drop_ignored_fields(item) for item in data]
+    return data
+
+class HarReplayer:
+    """Serves a recorded HAR through Playwright routing so tests run without the network"""
+
+    def __init__(self, har_path: str):
+        with open(har_path, 'r', encoding='utf-8') as f:
+            entries = json.load(f)["log"]["entries"]
+
+        # Exact match on method + URL + body, then a looser method + URL fallback
+        self.by_body = {}
+        self.by_url = {}
+        for entry in entries:
+            request = entry["request"]
+            url_key = (request["method"], normalize_url(request["url"]))
+            body_key = url_key + (normalize_body(request.get("postData", {}).get("text", "")),)
+            self.by_body.setdefault(body_key, []).append(entry)
+            self.by_url.setdefault(url_key, []).append(entry)
+
+        # Repeated identical requests replay their recorded responses in order
+        self.served = {}
+        self.misses = []
+
+    def find_entry(self, method: str, url: str, body: str):
+        """Find the recorded entry for a request, or None if it was never recorded"""
+        url_key = (method, normalize_url(url))
+        body_key = url_key + (normalize_body(body),)
+        key, candidates = body_key, self.by_body.get(body_key)
+        if not candidates:
+            key, candidates = url_key, self.by_url.get(url_key)
+        if not candidates:
+            return None
+
+        index = self.served.get(key, 0)
+        self.served[key] = index + 1
+        return candidates[min(index, len(candidates) - 1)]
+
+    def handle(self, route: Route):
+        """Route handler: fulfill from the HAR, abort anything not recorded"""
+        request = route.request
+        entry = self.find_entry(request.method, request.url, request.post_data or "")
+        if entry is None:
+            self.misses.append(f"{request.method} {request.url}")
+            route.abort()
+            return
+
+        response = entry["response"]
+        content = response.get("content", {})
+        text = content.get("text", "")
+        body = base64.b64decode(text) if content.get("encoding") == "base64" else text.encode("utf-8")
+        headers = {
+            header["name"]: header["value"] for header in response.get("headers", [])
+            if header["name"].lower() not in DROPPED_RESPONSE_HEADERS
+        }
+        route.fulfill(status=response["status"], headers=headers, body=body)
+
+    def attach(self, context: BrowserContext):
+        """Serve every request of a context from this HAR"""
+        context.route("**/*", self.handle)
@@ -1,20 +1,26 @@
 import os
 import base64
+import mimetypes
 from datetime import datetime
 from playwright.sync_api import Page
 
-def capture_screenshot(page: Page, filename: str = None):
-    """Capture screenshot and return path"""
+def capture_screenshot(page: Page, filename: str = None, only_if_changed: bool = False, exact_only: bool = False):
+    """Capture screenshot and return path; the file is written in the background (see screenshot_pipeline)"""
+    # Imported here: the pipeline itself imports get_worker_id from this module
+    from utils import screenshot_pipeline
+    
     if filename is None:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"screenshot_{timestamp}.png"
 
     screenshot_dir = "screenshots"
     os.makedirs(screenshot_dir, exist_ok=True)
+    filename = os.path.splitext(filename)[0] + screenshot_pipeline.get_extension()
     screenshot_path = os.path.join(screenshot_dir, filename)
     
     try:
-        page.screenshot(path=screenshot_path, timeout=5000)
+        raw_png = page.screenshot(timeout=5000)
+        screenshot_pipeline.submit(raw_png, screenshot_path, only_if_changed, exact_only)
         return screenshot_path
     except Exception as e:
         print(f"Screenshot capture failed: {e}")
@@ -28,7 +34,8 @@ def screenshot_to_base64(screenshot_path):
     try:
         with open(screenshot_path, "rb") as image_file:
             encoded_string = base64.b64encode(image_file.read()).decode()
-            return f"data:image/png;base64,{encoded_string}"
+            mime_type = mimetypes.guess_type(screenshot_path)[0] or "image/png"
+            return f"data:{mime_type};base64,{encoded_string}"
     except Exception as e:
         print(f"Failed to encode screenshot: {e}")
         return None
@@ -43,4 +50,10 @@ def get_page_title(page: Page):
 
 def get_current_url(page: Page):
     """Get current page URL"""
-    return page.url
\ No newline at end of file
+    return page.url
+
+def get_worker_id():
+    """Get an identifier for the current pytest worker process"""
+    return (os.environ.get("PYTEST_XDIST_WORKER")
+            or os.environ.get("TEST_WORKER_ID")
+            or "main")
\ No newline at end of file
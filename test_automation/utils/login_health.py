@@ -0,0 +1,85 @@
+import time
+from playwright.sync_api import Page
+from pages.login_page import LoginPage
+from config.config import Config
+from utils.helpers import get_worker_id
+
+class LoginUnavailableError(Exception):
+    """Raised instead of logging in while the login circuit is open"""
+
+# Per-worker breaker state; each pytest process has its own
+_probed = False
+_consecutive_failures = 0
+_root_cause = None
+_opened_at = None
+
+def describe_error(error: Exception):
+    """First line of an exception, prefixed with its type"""
+    lines = str(error).strip().splitlines()
+    return f"{type(error).__name__}: {lines[0] if lines else ''}"
+
+def is_open():
+    """Check whether authenticated tests are being short-circuited"""
+    return _opened_at is not None
+
+def _open(root_cause: str):
+    """Trip the breaker, keeping the failure that started the streak as the cause"""
+    global _opened_at, _root_cause
+    _root_cause = _root_cause or root_cause
+    _opened_at = time.time()
+    print(f"🔌 Login circuit opened on {get_worker_id()}: {_root_cause}")
+
+def record_success():
+    """A login worked: close the breaker and reset the failure streak"""
+    global _consecutive_failures, _root_cause, _opened_at
+    if is_open():
+        print(f"🔌 Login circuit closed on {get_worker_id()} after a successful re-probe")
+    _consecutive_failures = 0
+    _root_cause = None
+    _opened_at = None
+
+def record_failure(error: Exception):
+    """A login failed: open the breaker once the streak reaches the threshold, or again after a failed re-probe"""
+    global _consecutive_failures, _root_cause
+    _consecutive_failures += 1
+    _root_cause = _root_cause or describe_error(error)
+    if is_open() or _consecutive_failures >= Config.LOGIN_BREAKER_THRESHOLD:
+        _open(_root_cause)
+
+def probe(page: Page):
+    """Health check run once per worker: the login page has to load at all"""
+    global _probed, _consecutive_failures
+    _probed = True
+    try:
+        login_page = LoginPage(page)
+        login_page.navigate_to_login()
+        login_page.wait_for_page_load()
+    except Exception as e:
+        # Nothing can log in if the form never shows, so trip without waiting for a streak
+        _consecutive_failures += 1
+        _open(f"login page health check failed - {describe_error(e)}")
+
+def check(page: Page, node):
+    """Gate for tests that need a login: raises LoginUnavailableError while the circuit is open.
+
+    Once LOGIN_BREAKER_REPROBE_SECONDS have passed, one test is let through as the
+    re-probe and its login result decides whether the breaker closes.
+    """
+    global _opened_at
+    if not _probed:
+        probe(page)
+    if not is_open():
+        return
+
+    open_for = time.time() - _opened_at
+    if open_for >= Config.LOGIN_BREAKER_REPROBE_SECONDS:
+        # Restart the clock so only this test re-probes; record_success closes the breaker
+        _opened_at = time.time()
+        return
+
+    # Read by capture_test_results, which skips the failure screenshot of a page never used
+    node.login_short_circuited = True
+    raise LoginUnavailableError(
+        f"Login circuit open on {get_worker_id()} after {_consecutive_failures} failed login attempts. "
+        f"Root cause: {_root_cause} (next re-probe in {Config.LOGIN_BREAKER_REPROBE_SECONDS - open_for:.0f}s)"
+    )
@@ -0,0 +1,155 @@
+import re
+import time
+from playwright.sync_api import Page, Locator, TimeoutError
+
+# Playwright's "networkidle" fires after this long with no requests in flight
+NETWORK_IDLE_MS = 500
+
+# Only API traffic counts as a page's backend data, never the document or its assets
+DATA_RESOURCE_TYPES = ("fetch", "xhr")
+
+# Longest wait for a page's key element once its data has arrived (or its data wait ran out)
+READY_LOCATOR_TIMEOUT = 5000
+
+# Page loads measured since the last drain, collected per test by capture_test_results
+_readiness_records = []
+
+# Pages whose declared responses never showed up; later loads stop waiting for them
+_unmatched_pages = set()
+
+def api_response_patterns(*paths):
+    """READY_RESPONSES patterns matching exactly the given API paths; unset paths are left out"""
+    return [re.compile(rf"{re.escape(path)}(\?|$)") for path in paths if path]
+
+class NetworkTracker:
+    """Keeps the requests a page made so readiness and network idle can be worked out"""
+
+    def __init__(self, page: Page):
+        self.started = []
+        self.finished = []
+        self.responses = []
+        self.navigation_started_at = None
+        self.navigation_response_index = 0
+        page.on("request", self.started.append)
+        page.on("requestfinished", self.finished.append)
+        page.on("requestfailed", self.finished.append)
+        page.on("response", self.responses.append)
+
+    def mark_navigation(self):
+        """Start measuring a new page load from now"""
+        self.navigation_started_at = time.time() * 1000
+        self.navigation_response_index = len(self.responses)
+
+    def get_data_urls(self):
+        """URLs of the API responses received since the navigation started"""
+        return [
+            response.url for response in self.responses[self.navigation_response_index:]
+            if response.request.resource_type in DATA_RESOURCE_TYPES
+        ]
+
+    def has_data_response(self, url_pattern):
+        """Check an API response matching the pattern arrived since the navigation started"""
+        return any(
+            response.request.resource_type in DATA_RESOURCE_TYPES and url_pattern.search(response.url)
+            for response in self.responses[self.navigation_response_index:]
+        )
+
+    def estimate_network_idle_ms(self, started_at: float, until: float = None):
+        """Estimate when networkidle would have fired after started_at, or None if it never did"""
+        finished = set(id(request) for request in self.finished)
+        if until is None and any(id(request) not in finished for request in self.started):
+            return None
+
+        # Browser-side timings, so the estimate does not depend on when Python saw the events.
+        # Requests from a later navigation on the same page belong to that load, not this one.
+        intervals = []
+        for request in self.finished:
+            timing = request.timing
+            start = timing.get("startTime", -1)
+            if start < started_at or (until is not None and start >= until):
+                continue
+            end = start + max(timing.get("responseEnd", 0), 0)
+            intervals.append((start, end))
+
+        busy_until = started_at
+        for start, end in sorted(intervals):
+            if start > busy_until + NETWORK_IDLE_MS:
+                break
+            busy_until = max(busy_until, end)
+
+        return busy_until + NETWORK_IDLE_MS - started_at
+
+def get_tracker(page: Page):
+    """Get the network tracker for a page, attaching one on first use"""
+    tracker = getattr(page, "_readiness_tracker", None)
+    if tracker is None:
+        tracker = NetworkTracker(page)
+        page._readiness_tracker = tracker
+    return tracker
+
+def start_navigation(page: Page):
+    """Mark the start of a page load; call right before goto or the click that navigates"""
+    get_tracker(page).mark_navigation()
+
+def wait_until_ready(page: Page, page_name: str, ready_responses, ready_locator: Locator,
+                     timeout: int = 10000, locator_timeout: int = READY_LOCATOR_TIMEOUT):
+    """Return once the page's declared API responses have arrived and its key element has rendered.
+
+    The responses get `timeout` and the key element its own `locator_timeout`, so a data
+    wait that runs out does not leave the element with no time at all.
+    """
+    tracker = get_tracker(page)
+    if tracker.navigation_started_at is None:
+        tracker.mark_navigation()
+    started_at = tracker.navigation_started_at
+    deadline = time.time() + timeout / 1000
+
+    pending = [] if page_name in _unmatched_pages else list(ready_responses)
+    responses_timed_out = False
+    while pending:
+        pending = [pattern for pattern in pending if not tracker.has_data_response(pattern)]
+        remaining_ms = (deadline - time.time()) * 1000
+        if not pending:
+            break
+        if remaining_ms <= 0:
+            responses_timed_out = True
+            break
+        try:
+            # Any response wakes us up to re-check; the tracker has already stored it
+            page.wait_for_event("response", timeout=remaining_ms)
+        except TimeoutError:
+            responses_timed_out = True
+            break
+
+    if responses_timed_out:
+        # A pattern that matches nothing costs the full timeout on every load, so say so loudly
+        # and stop waiting for it in this worker
+        _unmatched_pages.add(page_name)
+        print(f"⚠️ READINESS: {page_name} never received {[pattern.pattern for pattern in pending]} "
+              f"within {timeout} ms. API responses seen: {tracker.get_data_urls() or 'none'}. "
+              f"Fix the page's READY_RESPONSES; later {page_name} loads wait for the element only.")
+
+    try:
+        ready_locator.wait_for(state="visible", timeout=locator_timeout)
+    finally:
+        _readiness_records.append({
+            "page": page_name,
+            "ready_ms": round(time.time() * 1000 - started_at, 1),
+            "responses_timed_out": responses_timed_out,
+            "tracker": tracker,
+            "started_at": started_at
+        })
+
+def drain_readiness_records():
+    """Return the page loads measured since the last call, with their networkidle estimates"""
+    records = []
+    for index, record in enumerate(_readiness_records):
+        tracker = record.pop("tracker")
+        later_loads = [later["started_at"] for later in _readiness_records[index + 1:]
+                       if later.get("tracker") is tracker and later["started_at"] > record["started_at"]]
+        networkidle_ms = tracker.estimate_network_idle_ms(record.pop("started_at"),
+                                                          min(later_loads) if later_loads else None)
+        record["networkidle_ms"] = round(networkidle_ms, 1) if networkidle_ms is not None else None
+        records.append(record)
+    _readiness_records.clear()
+    return records
@@ -0,0 +1,61 @@
+import os
+import shutil
+import hashlib
+from config.config import Config
+
+# Pillow is optional: without it the full image doubles as its own thumbnail
+try:
+    from PIL import Image
+    PILLOW_AVAILABLE = True
+except ImportError:
+    PILLOW_AVAILABLE = False
+
+THUMBNAIL_SIZE = (480, 270)
+
+def hash_file(path: str):
+    """Content hash used as the asset filename, so identical screenshots are stored once"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:20]
+
+def make_thumbnail(source_path: str, thumbnail_path: str):
+    """Write a downscaled JPEG thumbnail; returns False when Pillow is not installed"""
+    if not PILLOW_AVAILABLE:
+        return False
+    try:
+        with Image.open(source_path) as image:
+            image.thumbnail(THUMBNAIL_SIZE)
+            image.convert("RGB").save(thumbnail_path, "JPEG", quality=70)
+        return True
+    except OSError as e:
+        print(f"Failed to create thumbnail for {source_path}: {e}")
+        return False
+
+def store_screenshot_asset(screenshot_path: str, report_dir: str = "reports"):
+    """Store a screenshot under its content hash and return report-relative full and thumbnail paths"""
+    if not screenshot_path or not os.path.exists(screenshot_path):
+        return None
+
+    assets_dir = os.path.join(report_dir, Config.REPORT_ASSETS_DIR)
+    os.makedirs(assets_dir, exist_ok=True)
+
+    content_hash = hash_file(screenshot_path)
+    extension = os.path.splitext(screenshot_path)[1] or ".png"
+    full_name = f"{content_hash}{extension}"
+    thumbnail_name = f"{content_hash}_thumb.jpg"
+
+    full_path = os.path.join(assets_dir, full_name)
+    if not os.path.exists(full_path):
+        shutil.copyfile(screenshot_path, full_path)
+
+    thumbnail_path = os.path.join(assets_dir, thumbnail_name)
+    if not os.path.exists(thumbnail_path) and not make_thumbnail(full_path, thumbnail_path):
+        thumbnail_name = full_name
+
+    # Forward slashes: these are URLs relative to the report, not filesystem paths
+    return {
+        "full": f"{Config.REPORT_ASSETS_DIR}/{full_name}",
+        "thumbnail": f"{Config.REPORT_ASSETS_DIR}/{thumbnail_name}"
+    }
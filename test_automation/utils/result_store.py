@@ -0,0 +1,64 @@
+import os
+import json
+from config.config import Config
+from utils.helpers import get_worker_id
+
+def get_results_path(worker_id: str = None):
+    """Get path of a worker's JSONL results shard"""
+    worker_id = worker_id or get_worker_id()
+    return os.path.join(Config.RESULTS_DIR, f"results_{worker_id}.jsonl")
+
+def append_result(test_result: dict, worker_id: str = None):
+    """Append one test result to the worker's shard and force it to disk"""
+    os.makedirs(Config.RESULTS_DIR, exist_ok=True)
+    line = json.dumps(test_result, default=str) + "\n"
+
+    # One short append per result: a crash can at worst cut off the line being written
+    with open(get_results_path(worker_id), 'a', encoding='utf-8') as f:
+        f.write(line)
+        f.flush()
+        os.fsync(f.fileno())
+
+def clear_results():
+    """Remove every shard left over from an earlier run"""
+    if not os.path.isdir(Config.RESULTS_DIR):
+        return
+    for filename in os.listdir(Config.RESULTS_DIR):
+        if filename.endswith(".jsonl"):
+            os.remove(os.path.join(Config.RESULTS_DIR, filename))
+
+def read_shard(shard_path: str):
+    """Read the results in one shard, skipping a line cut short by a crash"""
+    results = []
+    with open(shard_path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                results.append(json.loads(line))
+            except ValueError:
+                print(f"Skipping unreadable result at {shard_path}:{line_number}")
+    return results
+
+def load_results(worker_ids=None):
+    """Merge the shards of the given workers (all workers by default) into one result list"""
+    if not os.path.isdir(Config.RESULTS_DIR):
+        return []
+
+    if worker_ids is None:
+        shard_paths = [
+            os.path.join(Config.RESULTS_DIR, filename)
+            for filename in sorted(os.listdir(Config.RESULTS_DIR))
+            if filename.endswith(".jsonl")
+        ]
+    else:
+        shard_paths = [get_results_path(worker_id) for worker_id in worker_ids]
+
+    merged_results = []
+    for shard_path in shard_paths:
+        if os.path.exists(shard_path):
+            merged_results.extend(read_shard(shard_path))
+
+    # Interleave workers back into execution order
+    merged_results.sort(key=lambda result: result.get('start_time', ''))
+    return merged_results
@@ -0,0 +1,151 @@
+import os
+import json
+from urllib.parse import urlsplit
+from playwright.sync_api import BrowserContext, Route, Error
+from config.config import Config
+from utils.helpers import get_worker_id
+
+# Known analytics and tracking hosts, blocked by the "minimal" profile
+ANALYTICS_PATTERNS = [
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net", "hotjar.com",
+    "segment.io", "segment.com", "mixpanel.com", "clarity.ms", "facebook.net", "sentry.io"
+]
+
+ROUTE_PROFILES = {
+    # Everything loads, exactly like a real user's browser
+    "full": {
+        "blocked_types": [],
+        "blocked_patterns": [],
+        "block_third_party_scripts": False
+    },
+    # Skip images, video/audio and web fonts; layout and scripts are untouched
+    "no-media": {
+        "blocked_types": ["image", "media", "font"],
+        "blocked_patterns": [],
+        "block_third_party_scripts": False
+    },
+    # Only what the app itself needs to render its DOM
+    "minimal": {
+        "blocked_types": ["image", "media", "font"],
+        "blocked_patterns": ANALYTICS_PATTERNS,
+        "block_third_party_scripts": True
+    }
+}
+
+class RouteBlocker:
+    """Aborts the requests a route profile excludes and counts what that saved"""
+
+    def __init__(self, profile_name: str, resource_sizes: dict):
+        if profile_name not in ROUTE_PROFILES:
+            raise ValueError(f"Unknown route profile '{profile_name}'. Available: {', '.join(ROUTE_PROFILES)}")
+        self.profile_name = profile_name
+        self.profile = ROUTE_PROFILES[profile_name]
+        self.resource_sizes = resource_sizes
+        self.app_host = urlsplit(Config.BASE_URL).hostname
+        self.blocked_requests = 0
+        self.blocked_bytes = 0
+        self.unknown_sizes = 0
+
+    def should_block(self, url: str, resource_type: str):
+        """Check whether the profile excludes a request"""
+        if resource_type in self.profile["blocked_types"]:
+            return True
+        if any(pattern in url for pattern in self.profile["blocked_patterns"]):
+            return True
+        if self.profile["block_third_party_scripts"] and resource_type == "script":
+            return urlsplit(url).hostname != self.app_host
+        return False
+
+    def handle(self, route: Route):
+        """Route handler: abort excluded requests, pass the rest on (to HAR replay or the network)"""
+        request = route.request
+        if not self.should_block(request.url, request.resource_type):
+            route.fallback()
+            return
+
+        self.blocked_requests += 1
+        size = self.resource_sizes.get(request.url)
+        if size is None:
+            self.unknown_sizes += 1
+        else:
+            self.blocked_bytes += size
+        route.abort("blockedbyclient")
+
+    def attach(self, context: BrowserContext):
+        """Apply the profile to a context; "full" adds no route at all"""
+        if self.profile["blocked_types"] or self.profile["blocked_patterns"] or self.profile["block_third_party_scripts"]:
+            context.route("**/*", self.handle)
+
+    def get_summary(self):
+        """Summary stored with the test result"""
+        return {
+            "profile": self.profile_name,
+            "blocked_requests": self.blocked_requests,
+            "blocked_bytes": self.blocked_bytes,
+            "unknown_sizes": self.unknown_sizes
+        }
+
+def learn_resource_sizes(context: BrowserContext, resource_sizes: dict):
+    """Remember response sizes so blocked requests can be costed in later tests and runs.
+
+    Only requests that load can be measured, so sizes of what a profile blocks come from
+    runs with the "full" profile or from recorded HARs (learn_sizes_from_hars).
+    """
+    def on_request_finished(request):
+        # The transferred body size, known even for chunked responses without content-length
+        try:
+            size = request.sizes()["responseBodySize"]
+        except Error:
+            return
+        if size > 0:
+            resource_sizes[request.url] = size
+
+    context.on("requestfinished", on_request_finished)
+
+def learn_sizes_from_hars(resource_sizes: dict):
+    """Add the response sizes in recorded HARs, which were captured with nothing blocked"""
+    if not os.path.isdir(Config.HAR_DIR):
+        return resource_sizes
+    for filename in os.listdir(Config.HAR_DIR):
+        if not filename.endswith(".har"):
+            continue
+        try:
+            with open(os.path.join(Config.HAR_DIR, filename), 'r', encoding='utf-8') as f:
+                entries = json.load(f)["log"]["entries"]
+        except (OSError, ValueError, KeyError):
+            continue
+        for entry in entries:
+            response = entry.get("response", {})
+            size = response.get("bodySize", -1)
+            if size <= 0:
+                size = response.get("content", {}).get("size", -1)
+            if size > 0:
+                resource_sizes.setdefault(entry["request"]["url"], size)
+    return resource_sizes
+
+def load_resource_sizes():
+    """Load response sizes learned by every worker in earlier sessions"""
+    resource_sizes = {}
+    if not os.path.isdir(Config.RESOURCE_SIZES_DIR):
+        return resource_sizes
+
+    for filename in os.listdir(Config.RESOURCE_SIZES_DIR):
+        if not filename.endswith(".json"):
+            continue
+        try:
+            with open(os.path.join(Config.RESOURCE_SIZES_DIR, filename), 'r') as f:
+                resource_sizes.update(json.load(f))
+        except (OSError, ValueError):
+            continue
+    return resource_sizes
+
+def save_resource_sizes(resource_sizes: dict):
+    """Save learned response sizes to this worker's own file"""
+    if not resource_sizes:
+        return
+    os.makedirs(Config.RESOURCE_SIZES_DIR, exist_ok=True)
+    sizes_path = os.path.join(Config.RESOURCE_SIZES_DIR, f"resource_sizes_{get_worker_id()}.json")
+    tmp_path = f"{sizes_path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(resource_sizes, f)
+    os.replace(tmp_path, sizes_path)
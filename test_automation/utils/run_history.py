@@ -0,0 +1,305 @@
+import os
+import re
+import sqlite3
+import subprocess
+from datetime import datetime
+from config.config import Config
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    recorded_at TEXT NOT NULL,
+    profile TEXT,
+    total INTEGER NOT NULL,
+    passed INTEGER NOT NULL,
+    failed INTEGER NOT NULL,
+    duration REAL NOT NULL,
+    base_url TEXT,
+    har_mode TEXT
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL REFERENCES runs(run_id),
+    test_id TEXT NOT NULL,
+    test_name TEXT NOT NULL,
+    module TEXT,
+    test_file TEXT,
+    status TEXT NOT NULL,
+    duration REAL NOT NULL,
+    setup REAL,
+    call REAL,
+    teardown REAL,
+    started_at REAL,
+    worker_id TEXT,
+    error_fingerprint TEXT,
+    screenshot_path TEXT,
+    trace_path TEXT,
+    attempts INTEGER NOT NULL DEFAULT 1
+);
+CREATE TABLE IF NOT EXISTS wait_latencies (
+    run_id INTEGER NOT NULL REFERENCES runs(run_id),
+    test_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    duration_ms REAL NOT NULL,
+    timed_out INTEGER NOT NULL,
+    timeout_ms REAL
+);
+CREATE INDEX IF NOT EXISTS results_by_test ON results (test_id, run_id);
+CREATE INDEX IF NOT EXISTS results_by_run ON results (run_id, status);
+CREATE INDEX IF NOT EXISTS results_by_fingerprint ON results (error_fingerprint);
+CREATE INDEX IF NOT EXISTS wait_latencies_by_name ON wait_latencies (name, run_id);
+"""
+
+# Columns added after a table was first shipped; CREATE TABLE IF NOT EXISTS leaves older databases without them
+ADDED_COLUMNS = {
+    "runs": [("base_url", "TEXT"), ("har_mode", "TEXT")],
+    "results": [("attempts", "INTEGER NOT NULL DEFAULT 1")],
+    "wait_latencies": [("timeout_ms", "REAL")]
+}
+
+def connect(db_path: str = None):
+    """Open the history database, creating its tables on first use"""
+    db_path = db_path or Config.HISTORY_DB
+    os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+    connection = sqlite3.connect(db_path)
+    connection.row_factory = sqlite3.Row
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.executescript(SCHEMA)
+    for table, columns in ADDED_COLUMNS.items():
+        existing = {row['name'] for row in connection.execute(f"PRAGMA table_info({table})")}
+        for column, definition in columns:
+            if column not in existing:
+                connection.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+    return connection
+
+def record_run(test_results, db_path: str = None):
+    """Store a finished run and every result in it; returns the new run id"""
+    if not test_results:
+        return None
+
+    passed = sum(1 for test in test_results if test['status'] == 'PASSED')
+    failed = sum(1 for test in test_results if test['status'] == 'FAILED')
+    duration = sum(test['duration'] for test in test_results)
+    # Taken from the results: in a parallel run only the workers know what they ran against
+    base_url = test_results[0].get('base_url', Config.BASE_URL)
+    har_mode = test_results[0].get('har_mode', Config.HAR_MODE)
+
+    connection = connect(db_path)
+    try:
+        with connection:
+            cursor = connection.execute(
+                "INSERT INTO runs (recorded_at, profile, total, passed, failed, duration, base_url, har_mode) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (datetime.now().isoformat(timespec="seconds"), os.environ.get("RUN_PROFILE"),
+                 len(test_results), passed, failed, duration, base_url, har_mode)
+            )
+            run_id = cursor.lastrowid
+            connection.executemany(
+                "INSERT INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (_result_row(run_id, test) for test in test_results)
+            )
+            connection.executemany(
+                "INSERT INTO wait_latencies VALUES (?, ?, ?, ?, ?, ?)",
+                ((run_id, test.get('test_id') or test['test_name'], wait['name'], wait['duration_ms'], wait['timed_out'],
+                  wait.get('timeout_ms'))
+                 for test in test_results for wait in test.get('waits', []))
+            )
+            _prune_runs(connection, run_id)
+    finally:
+        connection.close()
+    return run_id
+
+def _result_row(run_id, test):
+    """Flatten one test result into a results row"""
+    phases = test.get('phases') or {}
+    return (
+        run_id, test.get('test_id') or test['test_name'], test['test_name'], test.get('module'),
+        test.get('test_file'), test['status'], test['duration'], phases.get('setup'), phases.get('call'),
+        phases.get('teardown'), test.get('started_at'), test.get('worker_id'), test.get('error_fingerprint'),
+        test.get('screenshot_path'), test.get('trace_path'), test.get('attempts', 1)
+    )
+
+def _prune_runs(connection, latest_run_id):
+    """Drop runs older than the newest Config.HISTORY_MAX_RUNS"""
+    cutoff = latest_run_id - Config.HISTORY_MAX_RUNS
+    if cutoff <= 0:
+        return
+    connection.execute("DELETE FROM results WHERE run_id <= ?", (cutoff,))
+    connection.execute("DELETE FROM wait_latencies WHERE run_id <= ?", (cutoff,))
+    connection.execute("DELETE FROM runs WHERE run_id <= ?", (cutoff,))
+
+def get_recent_runs(limit: int = 20, db_path: str = None):
+    """Summary rows of the most recent runs, newest first"""
+    if not os.path.exists(db_path or Config.HISTORY_DB):
+        return []
+    connection = connect(db_path)
+    try:
+        rows = connection.execute(
+            "SELECT * FROM runs ORDER BY run_id DESC LIMIT ?", (limit,)
+        ).fetchall()
+        return [dict(row) for row in rows]
+    finally:
+        connection.close()
+
+def get_last_failed_tests(db_path: str = None):
+    """Ids of the tests that failed in the most recent run"""
+    if not os.path.exists(db_path or Config.HISTORY_DB):
+        return set()
+    connection = connect(db_path)
+    try:
+        rows = connection.execute(
+            "SELECT test_id FROM results WHERE run_id = (SELECT MAX(run_id) FROM runs) AND status = 'FAILED'"
+        ).fetchall()
+        return {row['test_id'] for row in rows}
+    finally:
+        connection.close()
+
+def get_action_baselines(base_url: str = None, har_mode: str = None, db_path: str = None):
+    """p99 duration, whether that sample timed out, and sample count of every named wait over the
+    last Config.TIMEOUT_HISTORY_RUNS runs against the same base URL in the same network mode"""
+    if not os.path.exists(db_path or Config.HISTORY_DB):
+        return {}
+    connection = connect(db_path)
+    try:
+        # Nearest-rank p99. A timed-out wait took at least its timeout, so it counts as that long
+        # rather than being dropped, which would leave only the fast samples to learn from
+        rows = connection.execute("""
+            SELECT name, duration_ms AS p99_ms, timed_out AS p99_timed_out, samples FROM (
+                SELECT name, duration_ms, timed_out,
+                       ROW_NUMBER() OVER (PARTITION BY name ORDER BY duration_ms, timed_out) AS position,
+                       COUNT(*) OVER (PARTITION BY name) AS samples
+                FROM (
+                    SELECT name, timed_out,
+                           CASE WHEN timed_out THEN MAX(duration_ms, COALESCE(timeout_ms, 0)) ELSE duration_ms END
+                               AS duration_ms
+                    FROM wait_latencies
+                    WHERE run_id IN (
+                        SELECT run_id FROM runs WHERE base_url IS ? AND har_mode IS ?
+                        ORDER BY run_id DESC LIMIT ?
+                    )
+                )
+            )
+            WHERE position = (samples * 99 + 99) / 100
+        """, (base_url, har_mode, Config.TIMEOUT_HISTORY_RUNS)).fetchall()
+        return {
+            row['name']: {'p99_ms': row['p99_ms'], 'p99_timed_out': bool(row['p99_timed_out']), 'samples': row['samples']}
+            for row in rows
+        }
+    finally:
+        connection.close()
+
+def get_status_changes(db_path: str = None):
+    """Tests that started failing and tests that were fixed in the latest run, against the one before"""
+    if not os.path.exists(db_path or Config.HISTORY_DB):
+        return {'new_failures': [], 'fixed': []}
+    connection = connect(db_path)
+    try:
+        run_ids = [row['run_id'] for row in connection.execute(
+            "SELECT run_id FROM runs ORDER BY run_id DESC LIMIT 2"
+        )]
+        if len(run_ids) < 2:
+            return {'new_failures': [], 'fixed': []}
+
+        query = """
+            SELECT latest.test_id FROM results latest
+            JOIN results previous ON previous.test_id = latest.test_id AND previous.run_id = ?
+            WHERE latest.run_id = ? AND latest.status = ? AND previous.status = ?
+            ORDER BY latest.test_id
+        """
+        latest_run, previous_run = run_ids
+        return {
+            'new_failures': [row['test_id'] for row in connection.execute(
+                query, (previous_run, latest_run, 'FAILED', 'PASSED'))],
+            'fixed': [row['test_id'] for row in connection.execute(
+                query, (previous_run, latest_run, 'PASSED', 'FAILED'))]
+        }
+    finally:
+        connection.close()
+
+def get_flake_scores(db_path: str = None):
+    """Flake score of every test with enough recent runs, flakiest first"""
+    if not os.path.exists(db_path or Config.HISTORY_DB):
+        return []
+    connection = connect(db_path)
+    try:
+        # A flip is a run whose status differs from the same test's previous run, or a quarantine
+        # retry that passed after failing; every retry is one more chance to flip
+        rows = connection.execute("""
+            SELECT test_id, COUNT(*) AS runs,
+                   SUM(status = 'FAILED') AS failures,
+                   SUM(previous_status IS NOT NULL AND previous_status != status)
+                       + SUM(attempts > 1 AND status = 'PASSED') AS flips,
+                   COUNT(*) - 1 + SUM(attempts - 1) AS chances
+            FROM (
+                SELECT test_id, status, attempts,
+                       LAG(status) OVER (PARTITION BY test_id ORDER BY run_id) AS previous_status
+                FROM results
+                WHERE run_id > (SELECT MAX(run_id) FROM runs) - ?
+            )
+            GROUP BY test_id
+            HAVING runs >= ?
+        """, (Config.FLAKE_WINDOW, Config.FLAKE_MIN_RUNS)).fetchall()
+    finally:
+        connection.close()
+
+    scores = []
+    for row in rows:
+        score = dict(row)
+        chances = score.pop('chances')
+        score['score'] = score['flips'] / chances if chances else 0.0
+        score['quarantined'] = score['score'] >= Config.FLAKE_THRESHOLD
+        scores.append(score)
+    return sorted(scores, key=lambda score: (score['score'], score['failures']), reverse=True)
+
+def get_quarantined_tests(db_path: str = None):
+    """Ids of the tests flaky enough to run in the quarantine lane"""
+    return {score['test_id'] for score in get_flake_scores(db_path) if score['quarantined']}
+
+def get_tracked_files(directory: str):
+    """Names of the files in a directory that git tracks; empty outside a git checkout"""
+    try:
+        result = subprocess.run(["git", "ls-files", "."], cwd=directory, capture_output=True, text=True)
+    except OSError:
+        return set()
+    if result.returncode != 0:
+        return set()
+    return {line for line in result.stdout.splitlines() if "/" not in line}
+
+def prune_reports(report_dir: str = "reports", keep: int = None):
+    """Delete timestamped HTML reports and timelines beyond the newest `keep`, then the assets
+    no remaining report links to; the history keeps their data. Files git tracks are left alone."""
+    keep = Config.REPORT_RETENTION if keep is None else keep
+    tracked = get_tracked_files(report_dir)
+    removed = 0
+    for prefix, extension in (("comprehensive_test_report_", ".html"), ("timeline_", ".json")):
+        # The timestamp in the name sorts chronologically
+        files = sorted(
+            filename for filename in os.listdir(report_dir)
+            if filename.startswith(prefix) and filename.endswith(extension) and filename not in tracked
+        )
+        for filename in files[:-keep] if keep else files:
+            os.remove(os.path.join(report_dir, filename))
+            removed += 1
+    return removed + prune_assets(report_dir)
+
+def prune_assets(report_dir: str = "reports"):
+    """Delete report assets (screenshots and thumbnails) that no HTML report in report_dir links to"""
+    assets_dir = os.path.join(report_dir, Config.REPORT_ASSETS_DIR)
+    if not os.path.isdir(assets_dir):
+        return 0
+
+    asset_link = re.compile(rf"{re.escape(Config.REPORT_ASSETS_DIR)}/([\w.-]+)")
+    referenced = set()
+    for filename in os.listdir(report_dir):
+        if not filename.endswith(".html"):
+            continue
+        # Line by line: reports with embedded assets can be large
+        with open(os.path.join(report_dir, filename), encoding="utf-8", errors="replace") as f:
+            for line in f:
+                referenced.update(asset_link.findall(line))
+
+    removed = 0
+    for filename in os.listdir(assets_dir):
+        if filename not in referenced:
+            os.remove(os.path.join(assets_dir, filename))
+            removed += 1
+    return removed
@@ -0,0 +1,119 @@
+import os
+import json
+from datetime import datetime
+from config.config import Config
+
+RUN_PROFILES = {
+    # As cheap as possible: headless, no video or trace, screenshots only for failures
+    "ci-fast": {
+        "headless": True,
+        "video": "off",
+        "trace_mode": "off",
+        "screenshot_policy": "on-failure",
+        "step_timing": "off",
+        "route_profile": "minimal",
+        "launch_args": ["--disable-gpu", "--disable-dev-shm-usage", "--disable-extensions", "--mute-audio"]
+    },
+    # Watch the browser locally; video and trace are kept only for failures
+    "debug": {
+        "headless": False,
+        "video": "retain-on-failure",
+        "trace_mode": "retain-on-failure",
+        "screenshot_policy": "always",
+        "step_timing": "on",
+        "route_profile": "full",
+        "launch_args": []
+    },
+    # Keep everything from every test, e.g. to chase an intermittent failure
+    "forensics": {
+        "headless": True,
+        "video": "on",
+        "trace_mode": "on",
+        "screenshot_policy": "always",
+        "step_timing": "on",
+        "route_profile": "full",
+        "launch_args": []
+    }
+}
+
+# Runs kept in the timing history
+MAX_PROFILE_TIMINGS = 200
+
+def get_profile(profile_name: str):
+    """Get a run profile by name"""
+    if profile_name not in RUN_PROFILES:
+        raise ValueError(f"Unknown run profile '{profile_name}'. Available: {', '.join(RUN_PROFILES)}")
+    return RUN_PROFILES[profile_name]
+
+def get_pytest_args(profile_name: str):
+    """pytest arguments for a profile; options given after these still override them"""
+    profile = get_profile(profile_name)
+    args = [
+        f"--video={profile['video']}",
+        f"--trace-mode={profile['trace_mode']}",
+        f"--screenshot-policy={profile['screenshot_policy']}",
+        f"--step-timing={profile['step_timing']}",
+        f"--route-profile={profile['route_profile']}"
+    ]
+    if not profile["headless"]:
+        args.append("--headed")
+    return args
+
+def apply_environment(profile_name: str):
+    """Export the settings pytest reads from the environment, for this process and every worker"""
+    profile = get_profile(profile_name)
+    os.environ["RUN_PROFILE"] = profile_name
+    os.environ["HEADLESS"] = "true" if profile["headless"] else "false"
+    os.environ["BROWSER_LAUNCH_ARGS"] = " ".join(profile["launch_args"])
+
+def load_profile_timings():
+    """Load the timing history of earlier runs"""
+    if not os.path.exists(Config.PROFILE_TIMINGS_PATH):
+        return []
+    try:
+        with open(Config.PROFILE_TIMINGS_PATH, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return []
+
+def record_profile_timing(profile_name: str, test_type: str, workers: int, tests: int, duration: float):
+    """Add a finished run to the timing history"""
+    timings = load_profile_timings()
+    timings.append({
+        "profile": profile_name,
+        "test_type": test_type,
+        "workers": workers,
+        "tests": tests,
+        "duration": round(duration, 2),
+        "recorded_at": datetime.now().isoformat()
+    })
+    timings = timings[-MAX_PROFILE_TIMINGS:]
+
+    os.makedirs(os.path.dirname(Config.PROFILE_TIMINGS_PATH), exist_ok=True)
+    tmp_path = f"{Config.PROFILE_TIMINGS_PATH}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(timings, f, indent=2)
+    os.replace(tmp_path, Config.PROFILE_TIMINGS_PATH)
+
+def summarize_profile_timings(timings: list):
+    """Average seconds per test for each profile, so their costs can be compared"""
+    summary = {}
+    for timing in timings:
+        profile = summary.setdefault(timing["profile"], {"runs": 0, "tests": 0, "duration": 0.0})
+        profile["runs"] += 1
+        profile["tests"] += timing["tests"]
+        # Parallel runs are compared on total worker time, not wall time
+        profile["duration"] += timing["duration"] * timing["workers"]
+    for profile in summary.values():
+        profile["per_test"] = profile["duration"] / profile["tests"] if profile["tests"] else None
+    return summary
+
+def print_profile_timings():
+    """Print the cost of each profile over the recorded runs"""
+    summary = summarize_profile_timings(load_profile_timings())
+    if not summary:
+        return
+    print(f"{'Profile':<12}{'Runs':>6}{'Tests':>7}{'Avg per test':>14}")
+    for profile_name, profile in sorted(summary.items()):
+        per_test = f"{profile['per_test']:.2f}s" if profile["per_test"] is not None else "-"
+        print(f"{profile_name:<12}{profile['runs']:>6}{profile['tests']:>7}{per_test:>14}")
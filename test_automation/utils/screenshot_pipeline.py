@@ -0,0 +1,343 @@
+import os
+import io
+import json
+import time
+import uuid
+import queue
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+from config.config import Config
+from utils.helpers import get_worker_id
+
+# Pillow is optional: without it screenshots are stored as captured (PNG) and only
+# byte-identical captures are deduplicated
+try:
+    from PIL import Image
+    PILLOW_AVAILABLE = True
+except ImportError:
+    PILLOW_AVAILABLE = False
+
+# dHash grid width; the hash has HASH_SIZE * HASH_SIZE bits
+HASH_SIZE = 16
+
+PIL_FORMATS = {"webp": "WEBP", "jpeg": "JPEG", "png": "PNG"}
+
+_queue = None
+_writers = []
+_writers_lock = threading.Lock()
+# Perceptual hash -> blob path of recently stored images, least recently used first
+_index = None
+_index_lock = threading.Lock()
+_stats_lock = threading.Lock()
+_stats = {
+    "captured": 0, "deduplicated": 0, "unchanged": 0, "failed": 0, "bytes_raw": 0, "bytes_written": 0,
+    # Time the test thread spent blocked on a full queue vs. time the writers spent per capture
+    "queue_wait_ms": 0.0, "background_ms": 0.0
+}
+
+def get_format():
+    """Format screenshots are stored in; PNG when Pillow is not available to re-encode"""
+    screenshot_format = Config.SCREENSHOT_FORMAT.lower()
+    if screenshot_format not in PIL_FORMATS:
+        raise ValueError(f"Unknown screenshot format '{screenshot_format}'. Available: {', '.join(PIL_FORMATS)}")
+    return screenshot_format if PILLOW_AVAILABLE else "png"
+
+def get_extension():
+    """File extension matching the stored format"""
+    return ".jpg" if get_format() == "jpeg" else f".{get_format()}"
+
+def image_hash(raw_png: bytes):
+    """Perceptual difference hash, or an exact content hash without Pillow"""
+    if not PILLOW_AVAILABLE:
+        return "sha:" + hashlib.sha256(raw_png).hexdigest()
+
+    with Image.open(io.BytesIO(raw_png)) as image:
+        pixels = list(image.convert("L").resize((HASH_SIZE + 1, HASH_SIZE)).getdata())
+    bits = 0
+    for row in range(HASH_SIZE):
+        for col in range(HASH_SIZE):
+            left = pixels[row * (HASH_SIZE + 1) + col]
+            right = pixels[row * (HASH_SIZE + 1) + col + 1]
+            bits = (bits << 1) | (left > right)
+    return f"dhash:{bits:0{HASH_SIZE * HASH_SIZE // 4}x}"
+
+def hash_distance(first: str, second: str):
+    """Number of differing bits between two perceptual hashes; exact hashes only match themselves"""
+    if first == second:
+        return 0
+    if not (first.startswith("dhash:") and second.startswith("dhash:")):
+        return None
+    return bin(int(first[6:], 16) ^ int(second[6:], 16)).count("1")
+
+def encode(raw_png: bytes):
+    """Re-encode a PNG capture into the configured format and quality"""
+    screenshot_format = get_format()
+    if screenshot_format == "png":
+        return raw_png
+
+    with Image.open(io.BytesIO(raw_png)) as image:
+        output = io.BytesIO()
+        image.convert("RGB").save(output, PIL_FORMATS[screenshot_format], quality=Config.SCREENSHOT_QUALITY)
+    return output.getvalue()
+
+def _index_path():
+    """Path of this worker's hash index"""
+    return os.path.join(Config.SCREENSHOT_INDEX_DIR, f"index_{get_worker_id()}.json")
+
+def _trim_index(index):
+    """Drop the least recently used entries beyond Config.SCREENSHOT_INDEX_SIZE"""
+    while len(index) > Config.SCREENSHOT_INDEX_SIZE:
+        index.popitem(last=False)
+    return index
+
+def _load_index():
+    """Load the hashes of images stored by every worker in earlier sessions"""
+    index = OrderedDict()
+    if not os.path.isdir(Config.SCREENSHOT_INDEX_DIR):
+        return index
+
+    for filename in sorted(os.listdir(Config.SCREENSHOT_INDEX_DIR)):
+        if not filename.endswith(".json"):
+            continue
+        try:
+            with open(os.path.join(Config.SCREENSHOT_INDEX_DIR, filename), 'r') as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            continue
+        index.update((content_hash, blob_path) for content_hash, blob_path in entries.items()
+                     if os.path.exists(blob_path))
+    return _trim_index(index)
+
+def _save_index():
+    """Save the hash index to this worker's own file"""
+    if not _index:
+        return
+    os.makedirs(Config.SCREENSHOT_INDEX_DIR, exist_ok=True)
+    index_path = _index_path()
+    tmp_path = f"{index_path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(_index, f)
+    os.replace(tmp_path, index_path)
+
+def get_blob_path(raw_png: bytes):
+    """Content-addressed path an image is stored under; it is never rewritten with other content"""
+    return os.path.join(Config.SCREENSHOT_BLOB_DIR, hashlib.sha256(raw_png).hexdigest()[:32] + get_extension())
+
+def find_duplicate(content_hash: str):
+    """Find the blob of a stored image near-identical to a new capture; call with _index_lock held"""
+    for stored_hash, blob_path in list(_index.items()):
+        distance = hash_distance(content_hash, stored_hash)
+        if distance is None or distance > Config.SCREENSHOT_DEDUP_DISTANCE:
+            continue
+        if os.path.exists(blob_path):
+            _index.move_to_end(stored_hash)
+            return blob_path
+        del _index[stored_hash]
+    return None
+
+def get_stored_hash(screenshot_path: str):
+    """Hash of the image a screenshot name shows: its blob's index entry, else the file decoded"""
+    stored = os.stat(screenshot_path)
+    with _index_lock:
+        entries = list(_index.items())
+    for stored_hash, blob_path in entries:
+        try:
+            blob = os.stat(blob_path)
+        except OSError:
+            continue
+        if (blob.st_ino, blob.st_dev) == (stored.st_ino, stored.st_dev):
+            return stored_hash
+    # Evicted from the index, or a copy on a filesystem without hard links; lossy formats
+    # decode slightly differently from the capture, which the dedup distance absorbs
+    with open(screenshot_path, 'rb') as f:
+        return image_hash(f.read())
+
+def is_unchanged(blob_path: str, screenshot_path: str, content_hash: str):
+    """Check a capture against the previous capture stored under the same name"""
+    if not os.path.exists(screenshot_path):
+        return False
+    if os.path.exists(blob_path) and os.path.samefile(blob_path, screenshot_path):
+        return True
+    try:
+        previous_hash = get_stored_hash(screenshot_path)
+    except OSError:
+        # Unreadable or not an image: store the new capture over it
+        return False
+    distance = hash_distance(content_hash, previous_hash)
+    return distance is not None and distance <= Config.SCREENSHOT_DEDUP_DISTANCE
+
+def _write_file(screenshot_path: str, data: bytes):
+    """Write through a temp file so hard links to the previous file keep their content"""
+    # A unique temp name per write: two writers storing the same name must not share one
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(screenshot_path) or ".",
+                                    prefix=f"{os.path.basename(screenshot_path)}.", suffix=".tmp")
+    with os.fdopen(fd, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, screenshot_path)
+
+def _link_file(existing_path: str, screenshot_path: str):
+    """Make screenshot_path point at an already stored image without another copy on disk"""
+    if os.path.abspath(existing_path) == os.path.abspath(screenshot_path):
+        return
+    # os.link needs a name that does not exist yet, so this one is made unique rather than created
+    tmp_path = f"{screenshot_path}.{uuid.uuid4().hex}.tmp"
+    try:
+        os.link(existing_path, tmp_path)
+    except OSError:
+        # Filesystems without hard links get a plain copy
+        with open(existing_path, 'rb') as f:
+            data = f.read()
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+    os.replace(tmp_path, screenshot_path)
+
+def process(raw_png: bytes, screenshot_path: str, only_if_changed: bool = False, exact_only: bool = False):
+    """Hash, deduplicate, encode and store one capture; returns the number of bytes written, or None if skipped.
+
+    The image is written once to its content-addressed blob and screenshot_path is linked to
+    it, so writing a name again never changes what other names show. exact_only keeps
+    near-identical images apart, e.g. failure evidence from an earlier passing capture.
+    """
+    global _index
+    blob_path = get_blob_path(raw_png)
+    content_hash = None
+    # Compared with this name's own previous capture, not with any stored image that looks alike
+    if only_if_changed and os.path.exists(screenshot_path):
+        content_hash = image_hash(raw_png)
+        with _index_lock:
+            if _index is None:
+                _index = _load_index()
+        if is_unchanged(blob_path, screenshot_path, content_hash):
+            return None
+
+    duplicate_path = blob_path if os.path.exists(blob_path) else None
+    if duplicate_path is None and not exact_only:
+        content_hash = content_hash or image_hash(raw_png)
+        with _index_lock:
+            if _index is None:
+                _index = _load_index()
+            duplicate_path = find_duplicate(content_hash)
+
+    if duplicate_path:
+        _link_file(duplicate_path, screenshot_path)
+        return 0
+
+    data = encode(raw_png)
+    os.makedirs(Config.SCREENSHOT_BLOB_DIR, exist_ok=True)
+    _write_file(blob_path, data)
+    _link_file(blob_path, screenshot_path)
+    with _index_lock:
+        if _index is None:
+            _index = _load_index()
+        _index[content_hash or image_hash(raw_png)] = blob_path
+        _trim_index(_index)
+    return len(data)
+
+def prune_blobs():
+    """Delete stored images no screenshot name links to any more; run while no worker is capturing"""
+    if not os.path.isdir(Config.SCREENSHOT_BLOB_DIR):
+        return 0
+    removed = 0
+    for filename in os.listdir(Config.SCREENSHOT_BLOB_DIR):
+        blob_path = os.path.join(Config.SCREENSHOT_BLOB_DIR, filename)
+        # The blob's own name is its only link once every screenshot using it is gone or rewritten
+        if os.stat(blob_path).st_nlink <= 1:
+            os.remove(blob_path)
+            removed += 1
+    return removed
+
+def _run_writer():
+    """Writer thread: store queued captures until the process exits"""
+    while True:
+        raw_png, screenshot_path, only_if_changed, exact_only = _queue.get()
+        started = time.perf_counter()
+        try:
+            bytes_written = process(raw_png, screenshot_path, only_if_changed, exact_only)
+            failed = False
+        except Exception as e:
+            print(f"Screenshot processing failed for {screenshot_path}: {e}")
+            bytes_written, failed = 0, True
+
+        with _stats_lock:
+            _stats["captured"] += 1
+            _stats["bytes_raw"] += len(raw_png)
+            _stats["bytes_written"] += bytes_written or 0
+            _stats["deduplicated"] += bytes_written == 0 and not failed
+            _stats["unchanged"] += bytes_written is None
+            _stats["failed"] += failed
+            _stats["background_ms"] += (time.perf_counter() - started) * 1000
+        # Only now, so flush() sees the stats of every capture it waited for
+        _queue.task_done()
+
+def _start_writers():
+    """Start the writer pool on first use"""
+    global _queue
+    with _writers_lock:
+        if _writers:
+            return
+        # Bounded: a test that outpaces the writers waits instead of holding every capture in memory
+        _queue = queue.Queue(maxsize=Config.SCREENSHOT_QUEUE_SIZE)
+        for number in range(Config.SCREENSHOT_WRITERS):
+            writer = threading.Thread(target=_run_writer, name=f"screenshot-writer-{number}", daemon=True)
+            writer.start()
+            _writers.append(writer)
+
+def submit(raw_png: bytes, screenshot_path: str, only_if_changed: bool = False, exact_only: bool = False):
+    """Queue a raw capture; the test thread returns without waiting for encoding or hashing"""
+    _start_writers()
+    started = time.perf_counter()
+    _queue.put((raw_png, screenshot_path, only_if_changed, exact_only))
+    with _stats_lock:
+        _stats["queue_wait_ms"] += (time.perf_counter() - started) * 1000
+
+def flush():
+    """Wait for every queued screenshot to be stored, then persist the hash index and stats"""
+    if not _writers:
+        return
+    _queue.join()
+    _save_index()
+    _save_stats()
+    if _stats["captured"]:
+        saved_kb = (_stats["bytes_raw"] - _stats["bytes_written"]) / 1024
+        print(f"Screenshots: {_stats['captured']} captured, {_stats['deduplicated']} deduplicated, "
+              f"{saved_kb:.0f} KB saved, {get_time_saved_ms(_stats) / 1000:.2f}s taken off tests")
+
+def get_time_saved_ms(stats: dict):
+    """Wall time tests would have spent storing screenshots themselves"""
+    return max(stats["background_ms"] - stats["queue_wait_ms"], 0)
+
+def _save_stats():
+    """Save this session's pipeline stats to this worker's own file"""
+    os.makedirs(Config.SCREENSHOT_STATS_DIR, exist_ok=True)
+    stats_path = os.path.join(Config.SCREENSHOT_STATS_DIR, f"screenshots_{get_worker_id()}.json")
+    tmp_path = f"{stats_path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(_stats, f)
+    os.replace(tmp_path, stats_path)
+
+def clear_stats():
+    """Remove stats left over from an earlier run"""
+    if not os.path.isdir(Config.SCREENSHOT_STATS_DIR):
+        return
+    for filename in os.listdir(Config.SCREENSHOT_STATS_DIR):
+        os.remove(os.path.join(Config.SCREENSHOT_STATS_DIR, filename))
+
+def load_stats():
+    """Sum the pipeline stats of every worker in this run"""
+    totals = {key: 0 for key in _stats}
+    if not os.path.isdir(Config.SCREENSHOT_STATS_DIR):
+        return totals
+
+    for filename in os.listdir(Config.SCREENSHOT_STATS_DIR):
+        if not filename.endswith(".json"):
+            continue
+        try:
+            with open(os.path.join(Config.SCREENSHOT_STATS_DIR, filename), 'r') as f:
+                worker_stats = json.load(f)
+        except (OSError, ValueError):
+            continue
+        for key in totals:
+            totals[key] += worker_stats.get(key, 0)
+    return totals
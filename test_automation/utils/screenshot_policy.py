@@ -0,0 +1,43 @@
+from datetime import datetime
+from playwright.sync_api import Page
+from config.config import Config
+from utils.helpers import capture_screenshot
+
+# always: every checkpoint, on-failure: none (the failure screenshot is taken by conftest),
+# sample: one checkpoint in SCREENSHOT_SAMPLE_RATE, on-change: only when the page looks
+# different from the last stored capture with the same name
+SCREENSHOT_POLICIES = ["always", "on-failure", "sample", "on-change"]
+
+_checkpoint_count = 0
+
+def set_policy(policy: str, sample_rate: int = None):
+    """Select the screenshot policy for this run"""
+    if policy not in SCREENSHOT_POLICIES:
+        raise ValueError(f"Unknown screenshot policy '{policy}'. Available: {', '.join(SCREENSHOT_POLICIES)}")
+    Config.SCREENSHOT_POLICY = policy
+    if sample_rate:
+        Config.SCREENSHOT_SAMPLE_RATE = sample_rate
+
+def should_capture():
+    """Check whether the current policy takes the next checkpoint screenshot"""
+    global _checkpoint_count
+    _checkpoint_count += 1
+
+    if Config.SCREENSHOT_POLICY == "on-failure":
+        return False
+    if Config.SCREENSHOT_POLICY == "sample":
+        # The first checkpoint, then every Nth after it
+        return (_checkpoint_count - 1) % max(Config.SCREENSHOT_SAMPLE_RATE, 1) == 0
+    return True
+
+def checkpoint(page: Page, filename: str = None):
+    """Screenshot a test checkpoint if the run's policy wants it; returns the path or None"""
+    if not should_capture():
+        return None
+    return capture_screenshot(page, filename, only_if_changed=Config.SCREENSHOT_POLICY == "on-change")
+
+def capture_failure(page: Page, test_name: str):
+    """Screenshot a failed test; every policy keeps these"""
+    filename = f"{test_name}_failure_{datetime.now().strftime('%H%M%S')}.png"
+    # Never stand in a near-identical earlier capture for the failing state
+    return capture_screenshot(page, filename, exact_only=True)
@@ -0,0 +1,115 @@
+import time
+import functools
+from contextlib import contextmanager
+from playwright.sync_api import Page, Locator
+
+# Playwright calls recorded as "action" spans once install() has patched them in
+TIMED_ACTIONS = {
+    Page: ["goto", "reload", "go_back", "wait_for_url", "wait_for_load_state", "wait_for_selector",
+           "wait_for_timeout", "wait_for_function", "evaluate", "screenshot"],
+    Locator: ["click", "dblclick", "fill", "clear", "press", "type", "check", "uncheck", "hover",
+              "select_option", "set_input_files", "wait_for", "is_visible", "is_enabled",
+              "text_content", "inner_text", "input_value", "count"]
+}
+
+# Read on every call instead of patching/unpatching, so a disabled run costs one check
+_enabled = False
+_installed = False
+
+# Spans finished since the last drain and the names of the spans currently open
+_spans = []
+_open_spans = []
+
+def enable(enabled: bool = True):
+    """Turn span recording on or off; the Playwright patches are installed the first time it is on"""
+    global _enabled
+    _enabled = enabled
+    if enabled:
+        install()
+
+def is_enabled():
+    """Check whether spans are being recorded"""
+    return _enabled
+
+@contextmanager
+def span(name: str, kind: str = "step", always: bool = False):
+    """Time a block as a span nested under whichever span is open.
+
+    Yields a dict the block can set "error" on for failures it handles itself.
+    always=True records the span even when step timing is off (used for fixtures).
+    """
+    details = {"error": None}
+    if not (_enabled or always):
+        yield details
+        return
+
+    depth = len(_open_spans)
+    _open_spans.append(name)
+    started_at = time.time() * 1000
+    started = time.perf_counter()
+    try:
+        yield details
+    except Exception as e:
+        details["error"] = type(e).__name__
+        raise
+    finally:
+        _open_spans.pop()
+        _spans.append({
+            "name": name,
+            "kind": kind,
+            "depth": depth,
+            "start_ms": round(started_at, 1),
+            "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+            "error": details["error"]
+        })
+
+def add_span(name: str, kind: str, start_ms: float, duration_ms: float, error: str = None):
+    """Record a span timed outside span(), e.g. one that starts and ends in different pytest hooks"""
+    _spans.append({
+        "name": name,
+        "kind": kind,
+        "depth": len(_open_spans),
+        "start_ms": round(start_ms, 1),
+        "duration_ms": round(duration_ms, 1),
+        "error": error
+    })
+
+def _timed(method, name: str, kind: str):
+    """Wrap a function so each call is recorded as a span"""
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        if not _enabled:
+            return method(*args, **kwargs)
+        with span(name, kind):
+            return method(*args, **kwargs)
+    wrapper._step_timed = True
+    return wrapper
+
+def timed_steps(cls):
+    """Class decorator for page objects: every public method becomes a step span"""
+    for attribute, value in list(vars(cls).items()):
+        if attribute.startswith("_") or not callable(value) or getattr(value, "_step_timed", False):
+            continue
+        setattr(cls, attribute, _timed(value, f"{cls.__name__}.{attribute}", "step"))
+    return cls
+
+def install():
+    """Patch the Playwright actions in TIMED_ACTIONS so they record action spans"""
+    global _installed
+    if _installed:
+        return
+    for playwright_class, method_names in TIMED_ACTIONS.items():
+        for method_name in method_names:
+            method = getattr(playwright_class, method_name, None)
+            if method is None or getattr(method, "_step_timed", False):
+                continue
+            setattr(playwright_class, method_name,
+                    _timed(method, f"{playwright_class.__name__.lower()}.{method_name}", "action"))
+    _installed = True
+
+def drain_spans():
+    """Return the spans finished since the last call, in start order"""
+    # Parents finish after their children, so ties on start time go to the outer span
+    spans = sorted(_spans, key=lambda recorded: (recorded["start_ms"], recorded["depth"]))
+    _spans.clear()
+    return spans
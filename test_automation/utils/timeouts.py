@@ -0,0 +1,37 @@
+from config.config import Config
+from utils import run_history
+
+# Learned p99 per action name, read from the run history once per process
+_baselines = None
+
+def load_baselines():
+    """Load the p99 latency and sample count of every named action over recent comparable runs"""
+    global _baselines
+    try:
+        # A replayed or stand-in run is far faster than the real host, so only like is compared with like
+        _baselines = run_history.get_action_baselines(Config.BASE_URL, Config.HAR_MODE)
+    except Exception as e:
+        # A locked or damaged history database must never stop a test from waiting
+        print(f"Adaptive timeouts unavailable, using defaults: {e}")
+        _baselines = {}
+    return _baselines
+
+def get_baseline(name: str):
+    """Learned baseline of an action, or None until it has Config.TIMEOUT_MIN_SAMPLES samples"""
+    baselines = _baselines if _baselines is not None else load_baselines()
+    baseline = baselines.get(name)
+    if baseline is None or baseline['samples'] < Config.TIMEOUT_MIN_SAMPLES:
+        return None
+    return baseline
+
+def get(name: str, default_ms: int):
+    """Timeout for a named action: its p99 times Config.TIMEOUT_MULTIPLIER, between the floor and the call site's default"""
+    if Config.ADAPTIVE_TIMEOUTS != "on":
+        return default_ms
+    baseline = get_baseline(name)
+    # A p99 that is a timed-out sample only repeats the timeout in force back; scaling it up
+    # would let a wait that times out by design grow its own timeout every run
+    if baseline is None or baseline['p99_timed_out']:
+        return default_ms
+    learned_ms = baseline['p99_ms'] * Config.TIMEOUT_MULTIPLIER
+    return round(min(max(learned_ms, Config.TIMEOUT_FLOOR_MS), default_ms))
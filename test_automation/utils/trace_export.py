@@ -0,0 +1,77 @@
+import json
+
+# Chrome trace-viewer colour names; waits stand out from the steps around them
+WAIT_COLOR = "thread_state_iowait"
+TIMED_OUT_COLOR = "terrible"
+FAILED_TEST_COLOR = "bad"
+
+def get_test_bounds(test):
+    """Start and end of a test in epoch ms, widened to cover its fixture setup, teardown and steps"""
+    duration_ms = test['duration'] * 1000
+    started_at = test.get('started_at')
+    steps = test.get('steps', [])
+    if started_at is None and not steps:
+        return None, None
+
+    starts = [step['start_ms'] for step in steps]
+    ends = [step['start_ms'] + step['duration_ms'] for step in steps]
+    if started_at is not None:
+        starts.append(started_at * 1000)
+        ends.append(started_at * 1000 + duration_ms)
+    return min(starts), max(ends)
+
+def _complete_event(name, category, start_ms, duration_ms, tid, args=None, color=None):
+    """One trace-event "X" (complete) slice; the format counts in microseconds"""
+    event = {
+        "name": name,
+        "cat": category,
+        "ph": "X",
+        "ts": round(start_ms * 1000),
+        "dur": max(round(duration_ms * 1000), 1),
+        "pid": 1,
+        "tid": tid
+    }
+    if args:
+        event["args"] = args
+    if color:
+        event["cname"] = color
+    return event
+
+def get_test_events(test, tid):
+    """Slices for one test: the test itself, then its fixture setups and teardowns, steps, actions and waits"""
+    test_start, test_end = get_test_bounds(test)
+    if test_start is None:
+        return []
+
+    events = [_complete_event(
+        test['test_name'], "test", test_start, test_end - test_start, tid,
+        args={"test_id": test.get('test_id'), "status": test['status'], "module": test['module']},
+        color=FAILED_TEST_COLOR if test['status'] == 'FAILED' else None
+    )]
+    for step in test.get('steps', []):
+        color = None
+        if step['kind'] == "wait":
+            color = TIMED_OUT_COLOR if step['error'] else WAIT_COLOR
+        events.append(_complete_event(
+            step['name'], step['kind'], step['start_ms'], step['duration_ms'], tid,
+            args={"error": step['error']} if step['error'] else None, color=color
+        ))
+    return events
+
+def export_chrome_trace(test_results, trace_path):
+    """Write the run as Chrome trace-event JSON, one row per worker; open in ui.perfetto.dev or chrome://tracing"""
+    worker_ids = sorted(set(test.get('worker_id', 'main') for test in test_results))
+    worker_rows = {worker_id: index + 1 for index, worker_id in enumerate(worker_ids)}
+
+    # Streamed event by event so large runs never hold the whole trace in memory
+    with open(trace_path, 'w', encoding='utf-8') as f:
+        f.write('{"displayTimeUnit": "ms", "traceEvents": [\n')
+        f.write(json.dumps({"name": "process_name", "ph": "M", "pid": 1, "args": {"name": "Test run"}}))
+        for worker_id, tid in worker_rows.items():
+            f.write(",\n" + json.dumps({"name": "thread_name", "ph": "M", "pid": 1, "tid": tid,
+                                        "args": {"name": worker_id}}))
+        for test in test_results:
+            for event in get_test_events(test, worker_rows[test.get('worker_id', 'main')]):
+                f.write(",\n" + json.dumps(event))
+        f.write("\n]}\n")
+    return trace_path
@@ -0,0 +1,47 @@
+import os
+import re
+from datetime import datetime
+from playwright.sync_api import BrowserContext
+from config.config import Config
+
+TRACE_MODES = ["on", "off", "retain-on-failure"]
+
+class TraceRecorder:
+    """Records a Playwright trace (DOM snapshots, screenshots, network) for one test"""
+
+    def __init__(self, context: BrowserContext, test_name: str, mode: str):
+        if mode not in TRACE_MODES:
+            raise ValueError(f"Unknown trace mode '{mode}'. Available: {', '.join(TRACE_MODES)}")
+        self.context = context
+        self.test_name = test_name
+        self.mode = mode
+        self.recording = False
+        self.trace_path = None
+
+    def start(self):
+        """Start tracing the context unless tracing is off"""
+        if self.mode == "off":
+            return
+        self.context.tracing.start(name=self.test_name, screenshots=True, snapshots=True)
+        self.recording = True
+
+    def stop(self, failed: bool):
+        """Stop tracing; the trace is saved when the mode keeps it, otherwise discarded. Safe to call twice."""
+        if not self.recording:
+            return self.trace_path
+        self.recording = False
+
+        if self.mode == "retain-on-failure" and not failed:
+            self.context.tracing.stop()
+            return None
+
+        # Playwright writes the trace as a compressed zip, ready for `playwright show-trace`
+        os.makedirs(Config.TRACE_DIR, exist_ok=True)
+        safe_name = re.sub(r"[^\w.-]", "_", self.test_name)
+        trace_path = os.path.join(Config.TRACE_DIR, f"{safe_name}_{datetime.now().strftime('%H%M%S')}.zip")
+        try:
+            self.context.tracing.stop(path=trace_path)
+            self.trace_path = trace_path
+        except Exception as e:
+            print(f"Failed to save trace for {self.test_name}: {e}")
+        return self.trace_path
@@ -0,0 +1,134 @@
+import json
+import time
+import uuid
+from playwright.sync_api import Page, Locator, TimeoutError
+from utils import step_timing
+from utils import timeouts
+
+# Waits recorded since the last drain, collected per test by capture_test_results
+_wait_records = []
+
+# Response waits whose URL pattern never matched in this worker; later calls watch the DOM instead
+_unmatched_responses = set()
+
+def _run_wait(name: str, kind: str, wait, timeout: int, replaces_ms: int, optional: bool):
+    """Run a wait, record how long it really took and, for optional waits, swallow the timeout"""
+    # The timeout given by the call site is the default until this wait has a learned baseline
+    default_timeout = timeout
+    timeout = timeouts.get(name, default_timeout)
+    baseline = timeouts.get_baseline(name)
+    started = time.perf_counter()
+    timed_out = False
+    try:
+        with step_timing.span(name, "wait") as span_details:
+            try:
+                return wait(timeout)
+            except TimeoutError:
+                timed_out = True
+                span_details["error"] = "TimeoutError"
+                if not optional:
+                    raise
+                return None
+    finally:
+        _wait_records.append({
+            "name": name,
+            "kind": kind,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+            "timeout_ms": timeout,
+            "default_timeout_ms": default_timeout,
+            "baseline_ms": baseline['p99_ms'] if baseline else None,
+            "replaces_ms": replaces_ms,
+            "timed_out": timed_out
+        })
+
+def after_response(page: Page, url_pattern, action, name: str, timeout: int = 10000,
+                   replaces_ms: int = None, optional: bool = True):
+    """Run an action and return as soon as a response matching the URL pattern arrives"""
+    def wait(timeout):
+        with page.expect_response(url_pattern, timeout=timeout) as response_info:
+            action()
+        return response_info.value
+
+    return _run_wait(name, "response", wait, timeout, replaces_ms, optional)
+
+def after_response_or_dom_change(page: Page, url_pattern, selector: str, action, name: str,
+                                 timeout: int = 10000, replaces_ms: int = None, optional: bool = True):
+    """after_response, or after_dom_change on the selector when there is no URL pattern or it never matched.
+
+    A pattern that matches nothing would cost the full timeout on every call, so after one miss
+    this worker watches the DOM instead, for no longer than the fixed wait this replaced.
+    """
+    if url_pattern is not None and name not in _unmatched_responses:
+        response = after_response(page, url_pattern, action, name, timeout, replaces_ms, optional)
+        if response is None:
+            _unmatched_responses.add(name)
+            print(f"⚠️ WAIT: {name} saw no response matching {url_pattern.pattern} within {timeout} ms; "
+                  f"later {name} waits watch {selector} instead")
+        return response
+    return after_dom_change(page, selector, action, name, timeout=min(timeout, replaces_ms or timeout),
+                            replaces_ms=replaces_ms, optional=optional)
+
+def after_dom_change(page: Page, selector: str, action, name: str, timeout: int = 5000,
+                     replaces_ms: int = None, optional: bool = True):
+    """Run an action and return as soon as content under a CSS selector changes.
+
+    Prefer after_response when the change comes from an API call: an action that leaves
+    the content as it was never mutates anything and this waits out the whole timeout.
+    """
+    # Observe before acting so a fast re-render cannot slip past the wait. The observer sits on
+    # the body, so it still sees the content when the matched element itself is replaced, and it
+    # ignores attributes, which hover and focus styling change all the time
+    flag = f"__wait_mutation_{uuid.uuid4().hex}"
+    page.evaluate("""([selector, flag]) => {
+        const element = (node) => node.nodeType === Node.ELEMENT_NODE ? node : node.parentElement;
+        const inside = (node) => element(node) && element(node).closest(selector);
+        const brings = (node) => inside(node) || (node.nodeType === Node.ELEMENT_NODE && node.querySelector(selector));
+        window[flag] = false;
+        const observer = new MutationObserver((mutations) => {
+            if (mutations.some(mutation => inside(mutation.target) || Array.from(mutation.addedNodes).some(brings))) {
+                window[flag] = true;
+                observer.disconnect();
+            }
+        });
+        observer.observe(document.body, {childList: true, subtree: true, characterData: true});
+    }""", [selector, flag])
+    action()
+
+    return _run_wait(
+        name, "dom_mutation",
+        lambda timeout: page.wait_for_function(f"() => window[{json.dumps(flag)}] === true", timeout=timeout),
+        timeout, replaces_ms, optional
+    )
+
+def until_element_state(locator: Locator, name: str, state: str = "visible", timeout: int = 5000,
+                        replaces_ms: int = None, optional: bool = True):
+    """Return as soon as an element reaches a state (visible, hidden, attached, detached)"""
+    return _run_wait(
+        name, "element_state",
+        lambda timeout: locator.wait_for(state=state, timeout=timeout),
+        timeout, replaces_ms, optional
+    )
+
+def until_url(page: Page, url_pattern, name: str, timeout: int = 10000,
+              replaces_ms: int = None, optional: bool = True):
+    """Return as soon as the page URL matches a glob, regex or predicate"""
+    return _run_wait(
+        name, "url_change",
+        lambda timeout: page.wait_for_url(url_pattern, timeout=timeout),
+        timeout, replaces_ms, optional
+    )
+
+def until_condition(page: Page, expression: str, name: str, timeout: int = 5000,
+                    replaces_ms: int = None, optional: bool = True):
+    """Return as soon as a JavaScript predicate evaluated in the page is truthy"""
+    return _run_wait(
+        name, "condition",
+        lambda timeout: page.wait_for_function(expression, timeout=timeout),
+        timeout, replaces_ms, optional
+    )
+
+def drain_wait_records():
+    """Return the waits recorded since the last call and start a fresh list"""
+    records = list(_wait_records)
+    _wait_records.clear()
+    return records